@@ -6,6 +6,7 @@ Compares performance with updated world.py (1m cells, squared distance optimizat
 vs previous configuration (10m cells).
 """
 import time
+from benchmark_utils import clean_timing
 from sim.core.world import World
 from sim.core.params import GlobalParams
 
@@ -51,14 +52,18 @@ def benchmark_collision_scenario(num_steps=50, num_agents=50):
     """Benchmark with collision-heavy workload."""
     world = create_collision_scenario(num_agents)
     
+    # FORCE spatial grid version, which the grid stats below report on
+    world._spatial_threshold = 0
+    
     # Warm up
     world.step()
     
     # Run benchmark
-    start_time = time.perf_counter()
-    for _ in range(num_steps):
-        world.step()
-    elapsed = time.perf_counter() - start_time
+    with clean_timing():
+        start_time = time.perf_counter()
+        for _ in range(num_steps):
+            world.step()
+        elapsed = time.perf_counter() - start_time
     
     # Calculate metrics
     total_time_ms = elapsed * 1000
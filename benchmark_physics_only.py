@@ -1,23 +1,52 @@
 #!/usr/bin/env python3
 """Pure physics simulation benchmark - no rendering, detailed timing analysis."""
 import time
+
 import numpy as np
+from benchmark_utils import clean_timing
 from sim.core.world import World
 from sim.core.params import GlobalParams
+from sim.core.kernels import plan_toward
+
+
+def _plan_toward(src_ids, src_xs, src_ys, src_alive,
+                 tgt_xs, tgt_ys, tgt_alive, out_vx, out_vy, out_move,
+                 actions, speed=10.0):
+    """Steer living source agents toward the target team's centroid.
+
+    Agents within 0.1 m of the centroid receive no action.
+
+    Args:
+        src_ids: Agent ids of the moving team
+        src_xs, src_ys, src_alive: Moving team SoA state
+        tgt_xs, tgt_ys, tgt_alive: Target team SoA state
+        out_vx, out_vy, out_move: Preallocated kernel output buffers
+        actions: Action dict to fill with agent_id -> (vx, vy)
+        speed: Desired speed (m/s)
+    """
+    if plan_toward(src_xs, src_ys, src_alive, tgt_xs, tgt_ys, tgt_alive,
+                   speed, out_vx, out_vy, out_move) == 0:
+        return
+
+    actions.update(zip(src_ids[out_move].tolist(),
+                       zip(out_vx[out_move].tolist(),
+                           out_vy[out_move].tolist())))
 
 
-def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
+def benchmark_physics_only(num_steps=300, num_agents_per_team=50, seed=42):
     """Run pure physics simulation with detailed performance benchmarking.
 
     Args:
         num_steps: Total simulation steps
         num_agents_per_team: Agents per team (100 total)
+        seed: Seed for the firing decisions
 
     Returns:
         Benchmark statistics
     """
     params = GlobalParams()
     world = World(params)
+    rng = np.random.default_rng(seed)
 
     # Add agents in two teams
     team0_agents = []
@@ -43,100 +72,121 @@ def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
     print(f"Configuration: {len(world.agents)} agents, {num_steps} steps")
     print()
 
-    # Detailed timing buckets
-    step_times = []
-    action_times = []
-    projectile_times = []
-    world_step_times = []
+    # Timing buckets in integer nanoseconds. Every step records its total
+    # time; only every sample_every-th step also times the components.
+    sample_every = 10
+    n_samples = -(-num_steps // sample_every)
+    step_times = np.empty(num_steps, dtype=np.int64)
+    action_times = np.empty(n_samples, dtype=np.int64)
+    projectile_times = np.empty(n_samples, dtype=np.int64)
+    world_step_times = np.empty(n_samples, dtype=np.int64)
+    running_step = 0.0
+
+    # Team membership is fixed, so resolve each team's rows in the world's
+    # SoA snapshot once
+    teams = world.agent_teams_array
+    team0_rows = np.flatnonzero(teams == 0)
+    team1_rows = np.flatnonzero(teams == 1)
+    team0_ids = np.asarray(team0_agents)
+    team1_ids = np.asarray(team1_agents)
+    n0 = len(team0_rows)
+    n1 = len(team1_rows)
+    team0_vx, team0_vy = np.empty(n0), np.empty(n0)
+    team1_vx, team1_vy = np.empty(n1), np.empty(n1)
+    team0_move = np.empty(n0, dtype=bool)
+    team1_move = np.empty(n1, dtype=bool)
+
+    positions = world.agent_positions_array
+    alive = world.agent_alive_array
+    team0_xs, team0_ys = positions[team0_rows].T
+    team1_xs, team1_ys = positions[team1_rows].T
+    team0_alive = alive[team0_rows]
+    team1_alive = alive[team1_rows]
+
+    # Compile (or load from cache) the planning kernel outside the timed loop
+    plan_toward(team0_xs, team0_ys, team0_alive, team1_xs, team1_ys,
+                team1_alive, 10.0, team0_vx, team0_vy, team0_move)
 
     print("[BENCHMARK] Starting physics simulation...")
     print()
 
-    total_start = time.perf_counter()
-
-    for step in range(num_steps):
-        step_start = time.perf_counter()
-
-        # ===== ACTION PLANNING =====
-        action_start = time.perf_counter()
-        actions = {}
-
-        # Team 0 moves toward team 1
-        if team1_agents:
-            team1_positions = [world.agent_dict[aid] for aid in team1_agents
-                               if aid in world.agent_dict and
-                               world.agent_dict[aid].alive]
-            if team1_positions:
-                centroid_x = np.mean([a.x for a in team1_positions])
-                centroid_y = np.mean([a.y for a in team1_positions])
-
-                for aid in team0_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 10
-                            vy = (dy / mag) * 10
-                            actions[aid] = (vx, vy)
-
-        # Team 1 moves toward team 0
-        if team0_agents:
-            team0_positions = [world.agent_dict[aid] for aid in team0_agents
-                               if aid in world.agent_dict and
-                               world.agent_dict[aid].alive]
-            if team0_positions:
-                centroid_x = np.mean([a.x for a in team0_positions])
-                centroid_y = np.mean([a.y for a in team0_positions])
-
-                for aid in team1_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 10
-                            vy = (dy / mag) * 10
-                            actions[aid] = (vx, vy)
-
-        action_time = time.perf_counter() - action_start
-        action_times.append(action_time)
-
-        # ===== PROJECTILE FIRING =====
-        projectile_start = time.perf_counter()
-
-        for agent in world.agents:
-            if agent.alive and np.random.random() < 0.30:
-                azimuth = np.random.uniform(0, 2*np.pi)
-                loft_angle = np.random.uniform(np.pi/6, np.pi/3)
-                speed = np.random.uniform(20, 35)
-                world.launch_projectile(agent.agent_id, azimuth, loft_angle,
-                                        speed)
-
-        projectile_time = time.perf_counter() - projectile_start
-        projectile_times.append(projectile_time)
-
-        # ===== WORLD STEP =====
-        world_step_start = time.perf_counter()
-        world.step(actions)
-        world_step_time = time.perf_counter() - world_step_start
-        world_step_times.append(world_step_time)
-
-        step_time = time.perf_counter() - step_start
-        step_times.append(step_time)
-
-        # Progress output every 50 steps
-        if (step + 1) % 50 == 0:
-            avg_step = np.mean(step_times[-50:])
-            steps_per_sec = 1.0 / avg_step if avg_step > 0 else 0
-            print(f"Step {step+1:3d}/{num_steps}: "
-                  f"avg={avg_step*1000:.2f}ms ({steps_per_sec:,.0f} steps/sec) | "
-                  f"agents={len(world.agents)} | "
-                  f"projectiles={len(world.projectiles)}")
-
-    total_time = time.perf_counter() - total_start
+    with clean_timing():
+        total_start = time.perf_counter_ns()
+        step_start = total_start
+
+        for step in range(num_steps):
+            sampled = step % sample_every == 0
+
+            # ===== ACTION PLANNING =====
+            actions = {}
+
+            # Gather each team's state from the world's SoA snapshot
+            positions = world.agent_positions_array
+            alive = world.agent_alive_array
+            team0_xs, team0_ys = positions[team0_rows].T
+            team1_xs, team1_ys = positions[team1_rows].T
+            team0_alive = alive[team0_rows]
+            team1_alive = alive[team1_rows]
+
+            # Each team moves toward the other team's centroid
+            _plan_toward(team0_ids, team0_xs, team0_ys, team0_alive,
+                         team1_xs, team1_ys, team1_alive,
+                         team0_vx, team0_vy, team0_move, actions)
+            _plan_toward(team1_ids, team1_xs, team1_ys, team1_alive,
+                         team0_xs, team0_ys, team0_alive,
+                         team1_vx, team1_vy, team1_move, actions)
+
+            if sampled:
+                action_end = time.perf_counter_ns()
+
+            # ===== PROJECTILE FIRING =====
+
+            # One Bernoulli draw for all living agents, then batched angles
+            fires = (rng.random(len(world.agents)) < 0.30) & alive
+            n_fire = int(fires.sum())
+            azimuths = rng.uniform(0, 2*np.pi, n_fire)
+            loft_angles = rng.uniform(np.pi/6, np.pi/3, n_fire)
+            speeds = rng.uniform(20, 35, n_fire)
+            world.launch_projectiles_batch(world.agent_id[fires], azimuths,
+                                           loft_angles, speeds)
+
+            if sampled:
+                projectile_end = time.perf_counter_ns()
+
+            # ===== WORLD STEP =====
+            world.step(actions)
+
+            step_end = time.perf_counter_ns()
+            step_time = step_end - step_start
+            step_times[step] = step_time
+            if sampled:
+                sample = step // sample_every
+                action_times[sample] = action_end - step_start
+                projectile_times[sample] = projectile_end - action_end
+                world_step_times[sample] = step_end - projectile_end
+            step_start = step_end
+
+            # Running mean avoids re-reducing the timing history per print
+            done = step + 1
+            running_step += (step_time - running_step) / done
+
+            # Progress output at powers of two (and the final step)
+            if done & (done - 1) == 0 or done == num_steps:
+                steps_per_sec = 1e9 / running_step if running_step > 0 else 0
+                print(f"Step {done:3d}/{num_steps}: "
+                      f"avg={running_step/1e6:.2f}ms ({steps_per_sec:,.0f} steps/sec) | "
+                      f"agents={len(world.agents)} | "
+                      f"projectiles={len(world.projectiles)}")
+                # Keep the print itself out of the next step's time
+                step_start = time.perf_counter_ns()
+
+        total_time = (time.perf_counter_ns() - total_start) / 1e9
+
+    # Convert to seconds only at report time
+    step_times = step_times / 1e9
+    action_times = action_times / 1e9
+    projectile_times = projectile_times / 1e9
+    world_step_times = world_step_times / 1e9
 
     print()
     print("=" * 80)
@@ -146,10 +196,10 @@ def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
 
     # Overall statistics
     total_steps = num_steps
-    avg_step_time = np.mean(step_times)
-    min_step_time = np.min(step_times)
-    max_step_time = np.max(step_times)
-    std_step_time = np.std(step_times)
+    avg_step_time = step_times.mean()
+    min_step_time = step_times.min()
+    max_step_time = step_times.max()
+    std_step_time = step_times.std()
     steps_per_sec = total_steps / total_time
 
     print(f"Total Execution Time: {total_time:.3f} seconds")
@@ -159,15 +209,15 @@ def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
 
     print("Step Timing Statistics:")
     print(f"  Average: {avg_step_time*1000:.3f} ms/step")
-    print(f"  Min:     {min_step_time*1000:.3f} ms/step (step {np.argmin(step_times)+1})")
-    print(f"  Max:     {max_step_time*1000:.3f} ms/step (step {np.argmax(step_times)+1})")
+    print(f"  Min:     {min_step_time*1000:.3f} ms/step (step {step_times.argmin()+1})")
+    print(f"  Max:     {max_step_time*1000:.3f} ms/step (step {step_times.argmax()+1})")
     print(f"  Std Dev: {std_step_time*1000:.3f} ms")
     print()
 
     # Component breakdown
-    avg_action_time = np.mean(action_times)
-    avg_projectile_time = np.mean(projectile_times)
-    avg_world_step_time = np.mean(world_step_times)
+    avg_action_time = action_times.mean()
+    avg_projectile_time = projectile_times.mean()
+    avg_world_step_time = world_step_times.mean()
 
     total_component_time = (avg_action_time + avg_projectile_time +
                             avg_world_step_time)
@@ -176,7 +226,7 @@ def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
     projectile_pct = (avg_projectile_time / total_component_time) * 100
     world_pct = (avg_world_step_time / total_component_time) * 100
 
-    print("Component Breakdown (average per step):")
+    print(f"Component Breakdown (average over every {sample_every}th step):")
     print(f"  Action Planning:   {avg_action_time*1000:.3f} ms ({action_pct:.1f}%)")
     print(f"  Projectile Fire:   {avg_projectile_time*1000:.3f} ms ({projectile_pct:.1f}%)")
     print(f"  World Step:        {avg_world_step_time*1000:.3f} ms ({world_pct:.1f}%)")
@@ -186,8 +236,8 @@ def benchmark_physics_only(num_steps=300, num_agents_per_team=50):
 
     # Final state
     print("Final Simulation State:")
-    blue_alive = sum(1 for a in world.agents if a.team == 0 and a.alive)
-    red_alive = sum(1 for a in world.agents if a.team == 1 and a.alive)
+    blue_alive = int(world.alive_per_team[0])
+    red_alive = int(world.alive_per_team[1])
     print(f"  Blue agents alive: {blue_alive}/{num_agents_per_team}")
     print(f"  Red agents alive:  {red_alive}/{num_agents_per_team}")
     print(f"  Total projectiles: {len(world.projectiles)}")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Shared helpers for the benchmark scripts."""
+import gc
+import sys
+import tracemalloc
+from contextlib import contextmanager
+
+
+@contextmanager
+def clean_timing(switch_interval: float = 1.0):
+    """Run the enclosed timed region under clean-room interpreter settings.
+
+    Collects and then disables the cyclic GC, clears any trace function,
+    suspends tracemalloc and raises the GIL switch interval to reduce
+    jitter in single-threaded runs. Everything is restored on exit.
+
+    Args:
+        switch_interval: GIL switch interval during the region (seconds)
+    """
+    gc_was_enabled = gc.isenabled()
+    old_trace = sys.gettrace()
+    old_interval = sys.getswitchinterval()
+    was_tracing = tracemalloc.is_tracing()
+
+    gc.collect()
+    gc.disable()
+    sys.settrace(None)
+    if was_tracing:
+        tracemalloc.stop()
+    sys.setswitchinterval(switch_interval)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(old_interval)
+        if was_tracing:
+            tracemalloc.start()
+        sys.settrace(old_trace)
+        if gc_was_enabled:
+            gc.enable()
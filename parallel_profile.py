@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Run independent 50v50 scenarios in parallel worker processes.
+
+Each run is fully independent (its own World and seeded PCG64 generator),
+so batches for timing variance, regression checks or parameter sweeps
+scale with the number of cores. Workers return a small summary dict
+rather than the World, to keep inter-process traffic down.
+
+Usage:
+    python parallel_profile.py [n_runs] [num_steps]
+"""
+import os
+import sys
+import time
+import multiprocessing as mp
+import numpy as np
+
+from profile_50v50 import run_large_scenario
+
+
+def _run_one(num_steps, num_agents_per_team, seed):
+    """Run one scenario and summarise it (executed in a worker process)."""
+    start = time.perf_counter()
+    world = run_large_scenario(num_steps=num_steps,
+                               num_agents_per_team=num_agents_per_team, seed=seed)
+    elapsed = time.perf_counter() - start
+    return {
+        'seed': seed,
+        'elapsed_s': elapsed,
+        'ms_per_step': 1000 * elapsed / num_steps,
+        'alive_per_team': world.alive_per_team[:2].tolist(),
+        'projectiles': world.projectile_count,
+        'collisions': world.collision_count,
+        'state_hash': world.get_state_hash(),
+    }
+
+
+def run_parallel(n_runs, num_steps=500, num_agents_per_team=50, base_seed=42,
+                 processes=None):
+    """Run n_runs scenarios across a process pool.
+
+    Args:
+        n_runs: Number of independent scenarios
+        num_steps: Steps per scenario
+        num_agents_per_team: Agents on each side
+        base_seed: Run i is seeded with base_seed + i
+        processes: Worker count (default: os.cpu_count())
+
+    Returns:
+        List of per-run summary dicts, in seed order
+    """
+    processes = min(processes or os.cpu_count() or 1, n_runs)
+    args = [(num_steps, num_agents_per_team, base_seed + i) for i in range(n_runs)]
+    # Spawned workers start clean instead of inheriting the parent's
+    # threads and compiled-kernel state through fork
+    with mp.get_context('spawn').Pool(processes) as pool:
+        return pool.starmap(_run_one, args, chunksize=1)
+
+
+if __name__ == '__main__':
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    num_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    print("=" * 80)
+    print(f"PARALLEL 50v50 PROFILE ({n_runs} runs x {num_steps} steps, "
+          f"{min(os.cpu_count() or 1, n_runs)} workers)")
+    print("=" * 80)
+    print()
+
+    wall_start = time.perf_counter()
+    results = run_parallel(n_runs, num_steps=num_steps)
+    wall = time.perf_counter() - wall_start
+
+    for r in results:
+        print(f"  seed {r['seed']}: {r['ms_per_step']:.3f} ms/step, "
+              f"alive {r['alive_per_team']}, {r['projectiles']} projectiles, "
+              f"{r['collisions']} collisions, hash {r['state_hash'][:12]}")
+
+    per_step = np.array([r['ms_per_step'] for r in results])
+    print()
+    print(f"  ms/step: mean {per_step.mean():.3f}, std {per_step.std():.3f}, "
+          f"min {per_step.min():.3f}, max {per_step.max():.3f}")
+    print(f"  Wall time: {wall:.2f} s for {sum(r['elapsed_s'] for r in results):.2f} s of runs")
@@ -8,89 +8,103 @@ Optimized profile script that separates simulation from I/O:
 import cProfile
 import pstats
 from io import StringIO
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from sim.core.world import World
+from sim.core.kernels import NUMBA_AVAILABLE, plan_seek_targets
 from sim.core.params import GlobalParams
 
 
-def run_large_scenario(num_steps=500, num_agents_per_team=50):
+# Teams smaller than this are planned serially: the ~15 us thread hand-off
+# costs more than a second core saves on the per-team kernel
+PARALLEL_MIN_TEAM = 256
+_planner_pool = (ThreadPoolExecutor(max_workers=2)
+                 if NUMBA_AVAILABLE and (os.cpu_count() or 1) > 1 else None)
+
+
+def _seek_nearest(world, src_idx, team, speed):
+    """Plan velocities steering each living agent of a team toward its nearest enemy.
+
+    Args:
+        world: World to plan for
+        src_idx: Row indices of the team, as np.where(world.team == team)[0]
+        team: Team being planned
+        speed: Desired speed (m/s)
+
+    Returns:
+        (agent_ids, vx, vy) arrays for the agents that should move
+    """
+    xy = world.xy
+    nearest = world.nearest_enemy_indices(team)
+    movable = world.alive[src_idx] & (nearest >= 0)
+    targets = xy[np.maximum(nearest, 0)]
+    # Scalars in the buffers' float type keep the kernel's math in float32
+    f = xy.dtype.type
+    idx, vx, vy = plan_seek_targets(xy[src_idx], movable, targets, f(speed), f(0.01))
+    return src_idx[idx], vx, vy
+
+
+def _plan_teams(world, team0_idx, team1_idx, speed):
+    """Plan both teams' moves toward their nearest enemies into world.action_v.
+
+    The two planners are independent (each only reads the other team's
+    positions), so when the kernels are compiled the team 1 planner runs
+    on a worker thread while team 0 is planned here.
+    """
+    args0 = (world, team0_idx, 0, speed)
+    args1 = (world, team1_idx, 1, speed)
+    if _planner_pool is not None and min(team0_idx.size, team1_idx.size) >= PARALLEL_MIN_TEAM:
+        future = _planner_pool.submit(_seek_nearest, *args1)
+        plans = (_seek_nearest(*args0), future.result())
+    else:
+        plans = (_seek_nearest(*args0), _seek_nearest(*args1))
+
+    # Rows of the world arrays are agent ids
+    action_v, has_action = world.action_v, world.has_action
+    for agent_ids, vx, vy in plans:
+        action_v[agent_ids, 0] = vx
+        action_v[agent_ids, 1] = vy
+        has_action[agent_ids] = True
+
+
+def run_large_scenario(num_steps=500, num_agents_per_team=50, seed=42):
     """Run 50v50 scenario without visualization for profiling.
 
     Pure physics simulation - no I/O, no rendering, minimal output.
+    Projectile fire is drawn from one PCG64 generator seeded with seed,
+    with one batched draw per quantity per step.
     """
     params = GlobalParams()
     world = World(params)
+    rng = np.random.default_rng(seed)
 
-    # Add 100 agents total
-    team0_agents = []
-    team1_agents = []
-
-    for i in range(num_agents_per_team):
-        x = 10 + (i % 10) * 5
-        y = 20 + (i // 10) * 10
-        agent_id = world.add_agent(team=0, x=x, y=y,
-                                   attributes={'health': 100, 'range': 50})
-        team0_agents.append(agent_id)
+    # Both teams in one grid formation each, added in a single bulk call
+    i = np.arange(num_agents_per_team)
+    offset_x = (i % 10) * 5
+    offset_y = 20 + (i // 10) * 10
+    world.add_agents_bulk(np.repeat([0, 1], num_agents_per_team),
+                          np.concatenate([10 + offset_x, 90 - offset_x]),
+                          np.tile(offset_y, 2))
 
-    for i in range(num_agents_per_team):
-        x = 90 - (i % 10) * 5
-        y = 20 + (i // 10) * 10
-        agent_id = world.add_agent(team=1, x=x, y=y,
-                                   attributes={'health': 100, 'range': 50})
-        team1_agents.append(agent_id)
+    team0_idx = np.where(world.team == 0)[0]
+    team1_idx = np.where(world.team == 1)[0]
 
     # Run simulation
     for step in range(num_steps):
-        # Agent movement toward enemies
-        actions = {}
-
-        if team1_agents:
-            team1_positions = [world.agent_dict[aid] for aid in team1_agents
-                               if aid in world.agent_dict and
-                               world.agent_dict[aid].alive]
-            if team1_positions:
-                centroid_x = np.mean([a.x for a in team1_positions])
-                centroid_y = np.mean([a.y for a in team1_positions])
-
-                for aid in team0_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 10
-                            vy = (dy / mag) * 10
-                            actions[aid] = (vx, vy)
-
-        if team0_agents:
-            team0_positions = [world.agent_dict[aid] for aid in team0_agents
-                               if aid in world.agent_dict and
-                               world.agent_dict[aid].alive]
-            if team0_positions:
-                centroid_x = np.mean([a.x for a in team0_positions])
-                centroid_y = np.mean([a.y for a in team0_positions])
-
-                for aid in team1_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 10
-                            vy = (dy / mag) * 10
-                            actions[aid] = (vx, vy)
+        # Each agent moves toward its nearest living enemy
+        _plan_teams(world, team0_idx, team1_idx, 10.0)
 
         # Projectile fire
-        for agent in world.agents:
-            if agent.alive and np.random.random() < 0.30:
-                azimuth = np.random.uniform(0, 2*np.pi)
-                loft_angle = np.random.uniform(np.pi/6, np.pi/3)
-                speed = np.random.uniform(20, 35)
-                world.launch_projectile(agent.agent_id, azimuth, loft_angle, speed)
-
-        world.step(actions)
+        fire_mask = world.alive & (rng.random(len(world.agents)) < 0.30)
+        shooters = world.agent_id[fire_mask]
+        k = shooters.size
+        azimuths = rng.uniform(0, 2*np.pi, k)
+        loft_angles = rng.uniform(np.pi/6, np.pi/3, k)
+        speeds = rng.uniform(20, 35, k)
+        world.launch_projectiles_batch(shooters, azimuths, loft_angles, speeds)
+
+        world.step()
 
     return world
 
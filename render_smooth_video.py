@@ -4,6 +4,8 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+from render_video_from_frames import frame_size, list_frame_files
+
 
 def render_smooth_video(frames_dir='debug/frames_smooth', fps=15):
     """Render MP4 video from PNG frames at specified FPS.
@@ -21,7 +23,7 @@ def render_smooth_video(frames_dir='debug/frames_smooth', fps=15):
     output_file = output_dir / f'phase2_smooth_{timestamp}.mp4'
 
     # Check frame count
-    frames = sorted(frames_path.glob('frame_*.png'))
+    frames = list_frame_files(frames_path) if frames_path.is_dir() else []
     frame_count = len(frames)
 
     if frame_count == 0:
@@ -29,9 +31,7 @@ def render_smooth_video(frames_dir='debug/frames_smooth', fps=15):
         return
 
     # Get frame dimensions
-    import cv2
-    first_frame = cv2.imread(str(frames[0]))
-    height, width = first_frame.shape[:2]
+    width, height = frame_size(frames_path, frames[0])
 
     print("=" * 80)
     print("RENDERING SMOOTH VIDEO")
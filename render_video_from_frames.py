@@ -1,11 +1,85 @@
 """Render video from saved PNG frames - standalone post-processing tool"""
 import cv2
-import glob
+import json
+import os
+import struct
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 
+def list_frame_files(frames_dir):
+    """Paths of frame_<N>.png files in frames_dir, in numeric frame order.
+    
+    One os.scandir pass with no per-file stat, sorted on the parsed frame
+    number instead of the path string.
+    """
+    frames_dir = os.fspath(frames_dir)
+    with os.scandir(frames_dir) as entries:
+        names = [e.name for e in entries
+                 if e.name.startswith('frame_') and e.name.endswith('.png')
+                 and e.name[6:-4].isdigit()]
+    names.sort(key=lambda name: int(name[6:-4]))
+    return [os.path.join(frames_dir, name) for name in names]
+
+
+def frame_size(frames_dir, first_frame):
+    """(width, height) of the frames without decoding an image.
+    
+    Uses meta.json in frames_dir when the producer wrote one
+    ({"width": ..., "height": ...}); otherwise reads the size from the
+    first frame's PNG header. Falls back to a full cv2.imread only when
+    neither is available.
+    
+    Returns:
+        (width, height), or None if the first frame cannot be read
+    """
+    meta_path = os.path.join(os.fspath(frames_dir), 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return int(meta['width']), int(meta['height'])
+    
+    # PNG signature, then the IHDR chunk holding big-endian width and height
+    with open(first_frame, 'rb') as f:
+        header = f.read(24)
+    if len(header) == 24 and header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    
+    image = cv2.imread(first_frame)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    return width, height
+
+
+def _decode_in_order(frame_files, workers=None):
+    """Yield (path, image) for frame_files in order, decoding ahead on threads.
+    
+    cv2.imread releases the GIL, so PNG decoding runs in parallel with the
+    caller's encoding. At most 2 * workers frames are decoded ahead to
+    keep memory bounded.
+    
+    Args:
+        frame_files: Ordered list of image paths
+        workers: Decode threads (default: os.cpu_count())
+    """
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for frame_file in frame_files:
+            pending.append((frame_file, pool.submit(cv2.imread, frame_file)))
+            if len(pending) >= window:
+                path, decoded = pending.popleft()
+                yield path, decoded.result()
+        while pending:
+            path, decoded = pending.popleft()
+            yield path, decoded.result()
+
+
 def render_video_from_frames(frames_dir, output_video, fps=30):
     """Create MP4 video from PNG frames
     
@@ -18,20 +92,20 @@ def render_video_from_frames(frames_dir, output_video, fps=30):
     output_video = Path(output_video)
     
     # Find all PNG frames
-    frame_files = sorted(glob.glob(str(frames_dir / "frame_*.png")))
+    frame_files = list_frame_files(frames_dir) if frames_dir.is_dir() else []
     if not frame_files:
         print(f"ERROR: No frames found in {frames_dir}")
         return False
     
     print(f"Found {len(frame_files)} PNG frames")
     
-    # Read first frame to get dimensions
-    first_frame = cv2.imread(frame_files[0])
-    if first_frame is None:
+    # Frame dimensions from meta.json or the first PNG header
+    size = frame_size(frames_dir, frame_files[0])
+    if size is None:
         print(f"ERROR: Could not read first frame: {frame_files[0]}")
         return False
     
-    height, width = first_frame.shape[:2]
+    width, height = size
     print(f"Frame dimensions: {width}x{height}")
     
     # Create video writer
@@ -43,8 +117,7 @@ def render_video_from_frames(frames_dir, output_video, fps=30):
         return False
     
     # Write all frames
-    for i, frame_file in enumerate(frame_files):
-        frame = cv2.imread(frame_file)
+    for i, (frame_file, frame) in enumerate(_decode_in_order(frame_files)):
         if frame is None:
             print(f"WARNING: Could not read {frame_file}")
             continue
@@ -1,20 +1,95 @@
 #!/usr/bin/env python3
 """Run 50v50 combat scenario end-to-end with video rendering."""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-import cv2
 from sim.core.world import World
+from sim.core.kernels import NUMBA_AVAILABLE, plan_seek_targets
 from sim.core.params import GlobalParams
 from sim.render.renderer2d import Renderer2D
+from sim.render.video import VideoSink
 
 
-def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos'):
+# Frames in flight between the simulation and the encoder before the
+# simulation waits for the render thread to catch up
+MAX_PENDING_FRAMES = 8
+
+# Teams smaller than this are planned serially: the ~15 us thread hand-off
+# costs more than a second core saves on the per-team kernel
+PARALLEL_MIN_TEAM = 256
+_planner_pool = (ThreadPoolExecutor(max_workers=2)
+                 if NUMBA_AVAILABLE and (os.cpu_count() or 1) > 1 else None)
+
+
+def _seek_nearest(world, src_idx, team, speed):
+    """Plan velocities steering each living agent of a team toward its nearest enemy.
+
+    Args:
+        world: World to plan for
+        src_idx: Row indices of the team, as np.where(world.team == team)[0]
+        team: Team being planned
+        speed: Desired speed (m/s)
+
+    Returns:
+        (agent_ids, vx, vy) arrays for the agents that should move
+    """
+    xy = world.xy
+    nearest = world.nearest_enemy_indices(team)
+    movable = world.alive[src_idx] & (nearest >= 0)
+    targets = xy[np.maximum(nearest, 0)]
+    # Scalars in the buffers' float type keep the kernel's math in float32
+    f = xy.dtype.type
+    idx, vx, vy = plan_seek_targets(xy[src_idx], movable, targets, f(speed), f(0.01))
+    return src_idx[idx], vx, vy
+
+
+def _snapshot(world):
+    """Copy the state Renderer2D draws, so the frame can be rendered off-thread.
+    
+    Returns:
+        frame_data dict for Renderer2D.render
+    """
+    return world.snapshot_arrays()
+
+
+def _plan_teams(world, team0_idx, team1_idx, speed):
+    """Plan both teams' moves toward their nearest enemies into world.action_v.
+
+    The two planners are independent (each only reads the other team's
+    positions), so when the kernels are compiled the team 1 planner runs
+    on a worker thread while team 0 is planned here.
+    """
+    args0 = (world, team0_idx, 0, speed)
+    args1 = (world, team1_idx, 1, speed)
+    if _planner_pool is not None and min(team0_idx.size, team1_idx.size) >= PARALLEL_MIN_TEAM:
+        future = _planner_pool.submit(_seek_nearest, *args1)
+        plans = (_seek_nearest(*args0), future.result())
+    else:
+        plans = (_seek_nearest(*args0), _seek_nearest(*args1))
+
+    # Rows of the world arrays are agent ids
+    action_v, has_action = world.action_v, world.has_action
+    for agent_ids, vx, vy in plans:
+        action_v[agent_ids, 0] = vx
+        action_v[agent_ids, 1] = vy
+        has_action[agent_ids] = True
+
+
+def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos', seed=42,
+                                  render_stride=3):
     """Run 50v50 scenario and render video with smooth interpolation.
     
+    Physics runs every step, but only every render_stride-th step is
+    rendered. ffmpeg interpolates the skipped frames back to 30 FPS.
+    
     Args:
         num_steps: Number of simulation steps
         output_dir: Directory to save video
+        seed: Seed for the projectile-fire RNG
+        render_stride: Render one frame every this many steps
     """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
@@ -22,6 +97,7 @@ def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos'):
     # Create world
     params = GlobalParams()
     world = World(params)
+    rng = np.random.default_rng(seed)
     
     print("=" * 80)
     print("50v50 COMBAT SCENARIO - VIDEO GENERATION")
@@ -30,26 +106,17 @@ def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos'):
     
     # Setup agents - Team 0 (Blue) on left, Team 1 (Red) on right
     print("Setting up agents...")
-    team0_agents = []
-    team1_agents = []
     
     # 50 agents per team, arranged in grid
-    for i in range(50):
-        x = 10 + (i % 10) * 4
-        y = 20 + (i // 10) * 8
-        agent_id = world.add_agent(team=0, x=x, y=y,
-                                   attributes={'health': 100, 'range': 50})
-        team0_agents.append(agent_id)
-    
-    for i in range(50):
-        x = 90 - (i % 10) * 4
-        y = 20 + (i // 10) * 8
-        agent_id = world.add_agent(team=1, x=x, y=y,
-                                   attributes={'health': 100, 'range': 50})
-        team1_agents.append(agent_id)
-    
-    print(f"  Team 0: {len(team0_agents)} agents")
-    print(f"  Team 1: {len(team1_agents)} agents")
+    i = np.arange(50)
+    offset_x = (i % 10) * 4
+    offset_y = 20 + (i // 10) * 8
+    world.add_agents_bulk(np.repeat([0, 1], 50),
+                          np.concatenate([10 + offset_x, 90 - offset_x]),
+                          np.tile(offset_y, 2))
+    
+    print(f"  Team 0: {int(world.alive_per_team[0])} agents")
+    print(f"  Team 1: {int(world.alive_per_team[1])} agents")
     print(f"  Total: {len(world.agents)} agents")
     print()
     
@@ -64,90 +131,76 @@ def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos'):
     output_file = output_path / f'50v50_scenario_{timestamp}.mp4'
     
     # Create video writer (30 FPS)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    video_writer = cv2.VideoWriter(str(output_file), fourcc, 30, (width, height))
+    video_writer = VideoSink(output_file, width, height,
+                             fps=30 / render_stride, output_fps=30)
     
     print("Running simulation and rendering...")
     print()
     
+    # Rendering and encoding run on their own single-worker threads, so
+    # frames are drawn and written in submission order while the main
+    # thread simulates ahead
+    render_pool = ThreadPoolExecutor(max_workers=1)
+    write_pool = ThreadPoolExecutor(max_workers=1)
+    pending_writes = deque()
+    
+    def render_frame(frame_data, title):
+        frame_rgb = renderer.render(title=title, frame_data=frame_data)
+        # Copy out before the next render reuses the canvas buffer
+        return frame_rgb.copy()
+    
+    def write_frame(rendered):
+        video_writer.write(rendered.result())
+    
     alive_counts = []
+    frames_rendered = 0
+    team0_idx = np.where(world.team == 0)[0]
+    team1_idx = np.where(world.team == 1)[0]
+    
+    # Living agents per team, read once per step from the world's counters
+    # and reused by the progress print, frame title and final stats
+    alive_team0 = int(world.alive_per_team[0])
+    alive_team1 = int(world.alive_per_team[1])
     
     # Main simulation loop
     for step in range(num_steps):
         if (step + 1) % 50 == 0:
-            alive_team0 = sum(1 for aid in team0_agents
-                            if aid in world.agent_dict and world.agent_dict[aid].alive)
-            alive_team1 = sum(1 for aid in team1_agents
-                            if aid in world.agent_dict and world.agent_dict[aid].alive)
             print(f"  Step {step + 1}/{num_steps}: Team 0: {alive_team0}, Team 1: {alive_team1}")
         
-        # Build action dictionary for agent movement
-        actions = {}
+        # Each agent moves toward its nearest living enemy
+        _plan_teams(world, team0_idx, team1_idx, 8.0)
         
-        # Team 0 moves toward Team 1 centroid
-        if team1_agents:
-            team1_positions = [world.agent_dict[aid] for aid in team1_agents
-                             if aid in world.agent_dict and
-                             world.agent_dict[aid].alive]
-            if team1_positions:
-                centroid_x = np.mean([a.x for a in team1_positions])
-                centroid_y = np.mean([a.y for a in team1_positions])
-                
-                for aid in team0_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 8
-                            vy = (dy / mag) * 8
-                            actions[aid] = (vx, vy)
-        
-        # Team 1 moves toward Team 0 centroid
-        if team0_agents:
-            team0_positions = [world.agent_dict[aid] for aid in team0_agents
-                             if aid in world.agent_dict and
-                             world.agent_dict[aid].alive]
-            if team0_positions:
-                centroid_x = np.mean([a.x for a in team0_positions])
-                centroid_y = np.mean([a.y for a in team0_positions])
-                
-                for aid in team1_agents:
-                    if aid in world.agent_dict and world.agent_dict[aid].alive:
-                        agent = world.agent_dict[aid]
-                        dx = centroid_x - agent.x
-                        dy = centroid_y - agent.y
-                        mag = np.sqrt(dx*dx + dy*dy)
-                        if mag > 0.1:
-                            vx = (dx / mag) * 8
-                            vy = (dy / mag) * 8
-                            actions[aid] = (vx, vy)
-        
-        # Projectile fire (30% chance per agent per step)
-        for agent in world.agents:
-            if agent.alive and np.random.random() < 0.25:
-                azimuth = np.random.uniform(0, 2*np.pi)
-                loft_angle = np.random.uniform(np.pi/6, np.pi/3)
-                speed = np.random.uniform(20, 35)
-                world.launch_projectile(agent.agent_id, azimuth, loft_angle, speed)
+        # Projectile fire (25% chance per agent per step)
+        fire_mask = world.alive & (rng.random(len(world.agents)) < 0.25)
+        shooters = world.agent_id[fire_mask]
+        k = shooters.size
+        azimuths = rng.uniform(0, 2*np.pi, k)
+        loft_angles = rng.uniform(np.pi/6, np.pi/3, k)
+        speeds = rng.uniform(20, 35, k)
+        world.launch_projectiles_batch(shooters, azimuths, loft_angles, speeds)
         
         # Step simulation
-        world.step(actions)
+        world.step()
         
         # Render frame
-        alive_team0 = sum(1 for aid in team0_agents
-                        if aid in world.agent_dict and world.agent_dict[aid].alive)
-        alive_team1 = sum(1 for aid in team1_agents
-                        if aid in world.agent_dict and world.agent_dict[aid].alive)
+        alive_team0 = int(world.alive_per_team[0])
+        alive_team1 = int(world.alive_per_team[1])
         alive_counts.append((alive_team0, alive_team1))
         
+        if step % render_stride:
+            continue
         title = f"50v50 Combat - Step {step + 1}/{num_steps} | Team 0: {alive_team0} | Team 1: {alive_team1}"
-        frame_rgb = renderer.render(title=title)
-        frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-        video_writer.write(frame_bgr)
+        rendered = render_pool.submit(render_frame, _snapshot(world), title)
+        frames_rendered += 1
+        pending_writes.append(write_pool.submit(write_frame, rendered))
+        if len(pending_writes) > MAX_PENDING_FRAMES:
+            pending_writes.popleft().result()
     
     # Clean up
+    for write in pending_writes:
+        write.result()
+    render_pool.shutdown()
+    write_pool.shutdown()
     video_writer.release()
     
     # Final stats
@@ -157,20 +210,14 @@ def run_50v50_scenario_with_video(num_steps=300, output_dir='output_videos'):
     print("=" * 80)
     print(f"Output video: {output_file}")
     print(f"  Resolution: {width}x{height}")
-    print(f"  Frames: {num_steps}")
+    print(f"  Frames: {frames_rendered} rendered (every {render_stride} of {num_steps} steps)")
     print(f"  Duration: {num_steps/30:.1f} seconds at 30 FPS")
     print(f"  File size: {output_file.stat().st_size / (1024*1024):.1f} MB")
     print()
     
-    # Final agent counts
-    final_team0 = sum(1 for aid in team0_agents
-                     if aid in world.agent_dict and world.agent_dict[aid].alive)
-    final_team1 = sum(1 for aid in team1_agents
-                     if aid in world.agent_dict and world.agent_dict[aid].alive)
-    
     print("Final State:")
-    print(f"  Team 0 surviving: {final_team0}/50")
-    print(f"  Team 1 surviving: {final_team1}/50")
+    print(f"  Team 0 surviving: {alive_team0}/50")
+    print(f"  Team 1 surviving: {alive_team1}/50")
     print(f"  Total projectiles fired: {world.projectile_count}")
     print(f"  Total collisions: {world.collision_count}")
     print()
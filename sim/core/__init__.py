@@ -1,6 +1,6 @@
 """sim.core module."""
 from .params import GlobalParams, CultureParams, AgentAttributeDistribution, load_scenario, save_scenario
-from .world import World, Agent, InfantryBlock, Event
+from .world import World, Agent, InfantryBlock, Event, EventLog
 
 __all__ = [
     'GlobalParams',
@@ -11,5 +11,6 @@ __all__ = [
     'World',
     'Agent',
     'InfantryBlock',
-    'Event'
+    'Event',
+    'EventLog'
 ]
@@ -0,0 +1,519 @@
+"""
+Compiled numeric kernels over SoA agent arrays.
+
+Kernels are JIT-compiled with Numba when it is installed. Without Numba the
+same functions run as plain Python, so results are identical but slower.
+
+The kernels World.step calls every step carry explicit signatures over the
+float32 SoA buffers, so they are compiled (or loaded from the on-disk
+cache) when this module is imported instead of inside the first step.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit: return the function undecorated."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True, fastmath=True)
+def plan_toward(xs, ys, alive, tgt_xs, tgt_ys, tgt_alive, speed,
+                out_vx, out_vy, out_move):
+    """
+    Steer living agents toward the centroid of the living target agents.
+
+    Agents that are dead or within 0.1 m of the centroid get
+    out_move[i] = False and their output velocity is left untouched.
+
+    Args:
+        xs, ys, alive: Source agent positions and alive flags
+        tgt_xs, tgt_ys, tgt_alive: Target agent positions and alive flags
+        speed: Desired speed (m/s)
+        out_vx, out_vy: Output desired velocity buffers (len(xs))
+        out_move: Output bool buffer, True where a velocity was written
+
+    Returns:
+        Number of agents that received a velocity
+    """
+    cx = 0.0
+    cy = 0.0
+    n_tgt = 0
+    for j in range(tgt_xs.shape[0]):
+        if tgt_alive[j]:
+            cx += tgt_xs[j]
+            cy += tgt_ys[j]
+            n_tgt += 1
+
+    n_move = 0
+    if n_tgt == 0:
+        for i in range(xs.shape[0]):
+            out_move[i] = False
+        return n_move
+
+    cx /= n_tgt
+    cy /= n_tgt
+    for i in range(xs.shape[0]):
+        dx = cx - xs[i]
+        dy = cy - ys[i]
+        mag = (dx * dx + dy * dy) ** 0.5
+        if alive[i] and mag > 0.1:
+            scale = speed / mag
+            out_vx[i] = dx * scale
+            out_vy[i] = dy * scale
+            out_move[i] = True
+            n_move += 1
+        else:
+            out_move[i] = False
+    return n_move
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def plan_seek(pos, alive, cx, cy, speed, min_mag2):
+    """
+    Steer living agents toward a fixed point (cx, cy) in one fused pass.
+
+    Compiled with nogil, so independent calls can run on separate threads.
+
+    Args:
+        pos: (N, 2) agent positions
+        alive: (N,) alive flags
+        cx, cy: Seek point
+        speed: Desired speed (m/s)
+        min_mag2: Agents with squared distance <= min_mag2 get no action
+
+    Returns:
+        (idx, vx, vy): rows of pos that received a velocity and the
+        velocity components, all of length k
+    """
+    n = pos.shape[0]
+    out_idx = np.empty(n, np.int64)
+    out_vx = np.empty(n, pos.dtype)
+    out_vy = np.empty(n, pos.dtype)
+    k = 0
+    for i in range(n):
+        if not alive[i]:
+            continue
+        dx = cx - pos[i, 0]
+        dy = cy - pos[i, 1]
+        m2 = dx * dx + dy * dy
+        if m2 > min_mag2:
+            inv = speed / math.sqrt(m2)
+            out_idx[k] = i
+            out_vx[k] = dx * inv
+            out_vy[k] = dy * inv
+            k += 1
+    return out_idx[:k], out_vx[:k], out_vy[:k]
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def plan_seek_targets(pos, alive, targets, speed, min_mag2):
+    """
+    Steer living agents toward per-agent target points in one fused pass.
+
+    Same as plan_seek, but agent i seeks targets[i] instead of a shared
+    point.
+
+    Args:
+        pos: (N, 2) agent positions
+        alive: (N,) flags; agents with alive[i] False get no action
+        targets: (N, 2) seek point of each agent
+        speed: Desired speed (m/s)
+        min_mag2: Agents with squared distance <= min_mag2 get no action
+
+    Returns:
+        (idx, vx, vy): rows of pos that received a velocity and the
+        velocity components, all of length k
+    """
+    n = pos.shape[0]
+    out_idx = np.empty(n, np.int64)
+    out_vx = np.empty(n, pos.dtype)
+    out_vy = np.empty(n, pos.dtype)
+    k = 0
+    for i in range(n):
+        if not alive[i]:
+            continue
+        dx = targets[i, 0] - pos[i, 0]
+        dy = targets[i, 1] - pos[i, 1]
+        m2 = dx * dx + dy * dy
+        if m2 > min_mag2:
+            inv = speed / math.sqrt(m2)
+            out_idx[k] = i
+            out_vx[k] = dx * inv
+            out_vy[k] = dy * inv
+            k += 1
+    return out_idx[:k], out_vx[:k], out_vy[:k]
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def plan_seek_speeds(pos, alive, cx, cy, speeds, out_v, out_move):
+    """
+    Steer living agents toward (cx, cy), each at its own speed.
+
+    Writes into caller-owned buffers, so World.action_v and
+    World.has_action can be passed directly. An agent exactly on the seek
+    point gets a zero velocity; dead agents get out_move[i] = False and
+    their output velocity is left untouched.
+
+    Args:
+        pos: (N, 2) agent positions
+        alive: (N,) alive flags
+        cx, cy: Seek point
+        speeds: (N,) desired speed of each agent (m/s)
+        out_v: (N, 2) output desired velocities
+        out_move: (N,) output bool, True where a velocity was written
+
+    Returns:
+        Number of agents that received a velocity
+    """
+    n_move = 0
+    for i in range(pos.shape[0]):
+        if not alive[i]:
+            out_move[i] = False
+            continue
+        dx = cx - pos[i, 0]
+        dy = cy - pos[i, 1]
+        # dx = dy = 0 on the seek point, so clamping the divisor gives a
+        # zero velocity there without a branch
+        scale = speeds[i] / max(math.sqrt(dx * dx + dy * dy), 1e-12)
+        out_v[i, 0] = dx * scale
+        out_v[i, 1] = dy * scale
+        out_move[i] = True
+        n_move += 1
+    return n_move
+
+
+@njit(cache=True, nogil=True)
+def nearest_enemies(xy, alive, team, query_rows):
+    """
+    Brute-force nearest living agent of another team for each query row.
+
+    Used when scipy is not installed. Ties go to the lowest row. Not
+    compiled with fastmath because the search starts from an infinite
+    distance.
+
+    Args:
+        xy: (N, 2) agent positions
+        alive: (N,) alive flags
+        team: (N,) agent teams
+        query_rows: (k,) rows to find enemies for
+
+    Returns:
+        (k,) int64 enemy rows, -1 where no enemy is alive
+    """
+    out = np.full(query_rows.shape[0], -1, np.int64)
+    for q in range(query_rows.shape[0]):
+        i = query_rows[q]
+        x = xy[i, 0]
+        y = xy[i, 1]
+        best_d2 = np.inf
+        for j in range(xy.shape[0]):
+            if alive[j] and team[j] != team[i]:
+                dx = xy[j, 0] - x
+                dy = xy[j, 1] - y
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best_d2 = d2
+                    out[q] = j
+    return out
+
+
+@njit('void(b1[:], f4[:, :], f4[:, :], f4[:], f4[:], f4[:], f4[:], f8, f8)',
+      cache=True, nogil=True)
+def update_kinematics(alive, desired_v, vxy, heading, agility, max_speed,
+                      acceleration, dt, friction):
+    """
+    Turn living agents toward their desired velocity and accelerate.
+
+    Fuses the heading turn, speed change and velocity update into one pass
+    per agent. Arithmetic is done in float64 and rounded on store, so the
+    compiled kernel and the plain-Python fallback agree bit for bit.
+
+    Args:
+        alive: (N,) alive flags; dead rows are left untouched
+        desired_v: (N, 2) desired velocities
+        vxy: (N, 2) velocities, updated in place
+        heading: (N,) headings (radians), updated in place
+        agility: (N,) max turn rate (rad/s)
+        max_speed: (N,) speed cap (m/s)
+        acceleration: (N,) max speed change (m/s^2)
+        dt: Timestep (seconds)
+        friction: Per-step velocity factor for agents with no desired speed
+    """
+    for i in range(alive.shape[0]):
+        if not alive[i]:
+            continue
+        dvx = np.float64(desired_v[i, 0])
+        dvy = np.float64(desired_v[i, 1])
+        h = np.float64(heading[i])
+
+        # Heading: turn toward desired direction, clamped by max turn rate
+        if dvx != 0 or dvy != 0:
+            diff = math.atan2(dvy, dvx) - h
+            diff = (diff + math.pi) % (2 * math.pi) - math.pi  # Wrap to [-pi, pi)
+            max_turn = np.float64(agility[i]) * dt
+            h += min(max(diff, -max_turn), max_turn)
+            heading[i] = h
+
+        # Speed: move toward desired speed within the acceleration limit,
+        # along the new heading; otherwise coast down by friction
+        vx = np.float64(vxy[i, 0])
+        vy = np.float64(vxy[i, 1])
+        desired_speed = min(math.sqrt(dvx * dvx + dvy * dvy), np.float64(max_speed[i]))
+        if desired_speed > 0:
+            current_speed = math.sqrt(vx * vx + vy * vy)
+            accel_limit = np.float64(acceleration[i]) * dt
+            new_speed = min(max(desired_speed, current_speed - accel_limit),
+                            current_speed + accel_limit)
+            vxy[i, 0] = new_speed * math.cos(h)
+            vxy[i, 1] = new_speed * math.sin(h)
+        else:
+            vxy[i, 0] = vx * friction
+            vxy[i, 1] = vy * friction
+
+
+@njit('void(f4[:, :], f4[:, :], b1[:], f8, f8, f8, f8)', cache=True, nogil=True)
+def integrate_positions(xy, vxy, alive, dt, margin, width, height):
+    """
+    Integrate living agents and clamp them to the arena bounds.
+
+    Agents pushed past a wall are placed margin inside it and their
+    velocity along that axis is zeroed.
+
+    Args:
+        xy: (N, 2) positions, updated in place
+        vxy: (N, 2) velocities, zeroed on the clamped axis
+        alive: (N,) alive flags; dead rows are left untouched
+        dt: Timestep (seconds)
+        margin: Minimum distance from a wall (the agent radius)
+        width, height: Arena size (meters)
+    """
+    for i in range(alive.shape[0]):
+        if not alive[i]:
+            continue
+        for axis in range(2):
+            limit = width if axis == 0 else height
+            pos = np.float64(xy[i, axis]) + np.float64(vxy[i, axis]) * dt
+            if pos - margin < 0:
+                pos = margin
+                vxy[i, axis] = 0
+            elif pos + margin > limit:
+                pos = limit - margin
+                vxy[i, axis] = 0
+            xy[i, axis] = pos
+
+
+@njit(['i8(i4[:], i4[:], f8[:, :], f8[:, :], b1[:], f8, i8[:], f8[:, :])',
+       'i8(i8[:], i8[:], f8[:, :], f8[:, :], b1[:], f8, i8[:], f8[:, :])'],
+      cache=True, nogil=True)
+def resolve_collisions(ia, ib, xy, vxy, alive, min_dist, hit_idx, hit_pos):
+    """
+    Separate overlapping agents among candidate pairs, in pair order.
+
+    Each collision updates positions and velocities before the next pair
+    is tested, exactly as World's scalar narrow phase did, so results
+    depend on pair order. Not compiled with fastmath so the output matches
+    the plain-Python fallback bit for bit.
+
+    Args:
+        ia, ib: (m,) candidate pairs (row ia[p], row ib[p])
+        xy: (N, 2) float64 positions, updated in place
+        vxy: (N, 2) float64 velocities, updated in place
+        alive: (N,) alive flags
+        min_dist: Center distance below which two agents overlap
+        hit_idx: (m,) output; entries [:k] are the pair indices that collided
+        hit_pos: (m, 2) output; entries [:k] are row_a's position after
+            each collision was resolved
+
+    Returns:
+        k, the number of collisions
+    """
+    min_dist_sq = min_dist * min_dist
+    k = 0
+    for p in range(ia.shape[0]):
+        i = ia[p]
+        j = ib[p]
+        if not alive[i] or not alive[j]:
+            continue
+
+        dx = xy[j, 0] - xy[i, 0]
+        dy = xy[j, 1] - xy[i, 1]
+        dist_sq = dx * dx + dy * dy
+        if dist_sq >= min_dist_sq:
+            continue
+
+        # One sqrt and one division: the reciprocal distance normalizes the
+        # offset, and dist_sq * inv_dist recovers the distance
+        if dist_sq > 0:
+            inv_dist = 1.0 / math.sqrt(dist_sq)
+            dist = dist_sq * inv_dist
+            dx_norm = dx * inv_dist
+            dy_norm = dy * inv_dist
+        else:
+            dist = 0.0
+            dx_norm = 1.0
+            dy_norm = 0.0
+
+        # Cancel the approaching part of the relative normal velocity
+        dvn = (vxy[j, 0] - vxy[i, 0]) * dx_norm + (vxy[j, 1] - vxy[i, 1]) * dy_norm
+        if dvn < 0:
+            vxy[i, 0] += dvn * dx_norm
+            vxy[i, 1] += dvn * dy_norm
+            vxy[j, 0] -= dvn * dx_norm
+            vxy[j, 1] -= dvn * dy_norm
+
+        # Push the pair apart along their offset
+        sep = (min_dist - dist) / 2 + 0.001
+        xy[i, 0] -= sep * dx
+        xy[i, 1] -= sep * dy
+        xy[j, 0] += sep * dx
+        xy[j, 1] += sep * dy
+
+        hit_idx[k] = p
+        hit_pos[k, 0] = xy[i, 0]
+        hit_pos[k, 1] = xy[i, 1]
+        k += 1
+    return k
+
+
+@njit(cache=True, nogil=True)
+def relink_cells(xy, alive, cell_size, grid_w, grid_h, cell_of, head, nxt, prv):
+    """
+    Move agent rows whose grid cell changed between per-cell linked lists.
+
+    Each cell's rows form a doubly linked list (head[c], then nxt[row]),
+    so a row that changes cell is unlinked and pushed onto its new cell
+    in O(1); rows that stay in their cell cost one comparison.
+
+    Args:
+        xy: (N, 2) agent positions
+        alive: (N,) alive flags; dead rows are unlinked and get cell -1
+        cell_size: Cell size (meters)
+        grid_w, grid_h: Grid dimensions in cells
+        cell_of: (N,) int64 cells from the previous call, updated in place
+        head: (n_cells,) first row of each cell's list, -1 if empty
+        nxt, prv: (N,) next and previous row in the same cell, -1 at the ends
+
+    Returns:
+        The number of rows that changed cell
+    """
+    moved = 0
+    for i in range(xy.shape[0]):
+        c = -1
+        if alive[i]:
+            col = min(max(int(xy[i, 0] / cell_size), 0), grid_w - 1)
+            row = min(max(int(xy[i, 1] / cell_size), 0), grid_h - 1)
+            c = row * grid_w + col
+        old = cell_of[i]
+        if c == old:
+            continue
+        moved += 1
+        if old >= 0:
+            p = prv[i]
+            q = nxt[i]
+            if p >= 0:
+                nxt[p] = q
+            else:
+                head[old] = q
+            if q >= 0:
+                prv[q] = p
+        if c >= 0:
+            q = head[c]
+            nxt[i] = q
+            prv[i] = -1
+            if q >= 0:
+                prv[q] = i
+            head[c] = i
+        cell_of[i] = c
+    return moved
+
+
+@njit(cache=True, nogil=True)
+def bucket_by_cell(cell_of, cell_starts, cursor, rows):
+    """
+    Counting sort of agent rows by cell into preallocated CSR arrays.
+
+    Args:
+        cell_of: (N,) flat cell of each row, -1 for rows to leave out
+        cell_starts: (n_cells + 1,) output offsets of each cell's run
+        cursor: (n_cells,) scratch
+        rows: (>= N,) output; rows[:k] are the bucketed rows, ascending
+            within each cell
+
+    Returns:
+        k, the number of bucketed rows
+    """
+    n_cells = cursor.shape[0]
+    cell_starts[:] = 0
+    for i in range(cell_of.shape[0]):
+        if cell_of[i] >= 0:
+            cell_starts[cell_of[i] + 1] += 1
+    for c in range(n_cells):
+        cell_starts[c + 1] += cell_starts[c]
+        cursor[c] = cell_starts[c]
+    for i in range(cell_of.shape[0]):
+        c = cell_of[i]
+        if c >= 0:
+            rows[cursor[c]] = i
+            cursor[c] += 1
+    return cell_starts[n_cells]
+
+
+@njit(cache=True, nogil=True)
+def grid_neighbor_pairs(cell_of, head, nxt, grid_w, grid_h, ia, ib):
+    """
+    Every pair of gridded agents in the same or adjacent cells.
+
+    Pairs come out sorted by (row_a, row_b), the order of a nested i < j
+    loop, without a global sort: each agent's higher-row neighbors in its
+    3x3 cell block are gathered from the cell lists and insertion-sorted
+    in place. Pairs past the end of the output buffers are only counted.
+
+    Args:
+        cell_of: (N,) flat cell of each agent row, -1 for rows not gridded
+        head: (n_cells,) first row of each cell's list, -1 if empty
+        nxt: (N,) next row in the same cell, -1 at the end
+        grid_w, grid_h: Grid dimensions in cells
+        ia, ib: Output pair buffers; [:total] holds pairs with ia < ib
+
+    Returns:
+        total, the number of pairs. If it exceeds len(ia) the buffers hold
+        no usable output and the call should be repeated with larger ones.
+    """
+    capacity = ia.shape[0]
+    k = 0
+    for a in range(cell_of.shape[0]):
+        c = cell_of[a]
+        if c < 0:
+            continue
+        r = c // grid_w
+        col = c - r * grid_w
+        c0 = max(col - 1, 0)
+        c1 = min(col + 1, grid_w - 1)
+        start = k
+        for rr in range(max(r - 1, 0), min(r + 1, grid_h - 1) + 1):
+            for cc in range(rr * grid_w + c0, rr * grid_w + c1 + 1):
+                b = head[cc]
+                while b >= 0:
+                    if b > a:
+                        if k < capacity:
+                            # Insertion into the sorted run ib[start:k]
+                            p = k
+                            while p > start and ib[p - 1] > b:
+                                ib[p] = ib[p - 1]
+                                p -= 1
+                            ib[p] = b
+                            ia[k] = a
+                        k += 1
+                    b = nxt[b]
+    return k
@@ -12,8 +12,15 @@ from typing import Dict, Any
 import json
 import yaml
 
+# libyaml's C parser and emitter are ~10x faster than PyYAML's pure-Python
+# ones; fall back to those when PyYAML was built without libyaml
+try:
+    from yaml import CSafeLoader as YamlLoader, CDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, Dumper as YamlDumper
 
-@dataclass
+
+@dataclass(slots=True)
 class GlobalParams:
     """Global simulation parameters (non-negotiable constants)."""
     
@@ -62,7 +69,7 @@ class GlobalParams:
         return GlobalParams.from_dict(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CultureParams:
     """
     Cultural reward weights and tactical preferences.
@@ -83,7 +90,7 @@ class CultureParams:
         return CultureParams(**d)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentAttributeDistribution:
     """
     Distributions for random agent attribute initialization.
@@ -116,10 +123,10 @@ class AgentAttributeDistribution:
 def load_scenario(yaml_path: str) -> Dict[str, Any]:
     """Load scenario from YAML file."""
     with open(yaml_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
 
 
 def save_scenario(scenario: Dict[str, Any], yaml_path: str):
     """Save scenario to YAML file."""
     with open(yaml_path, 'w') as f:
-        yaml.dump(scenario, f, default_flow_style=False)
+        yaml.dump(scenario, f, Dumper=YamlDumper, default_flow_style=False)
@@ -6,13 +6,18 @@ Features:
 - Ground impact detection (flat terrain only for Phase 2)
 - Replay-safe: trajectory determined entirely by initial state and RNG seed
 - Event logging on impact
+- Structure-of-arrays storage (ProjectilePool), with Projectile objects as row views
 """
 
+import math
 import numpy as np
-from typing import Tuple, Optional, List
-from dataclasses import dataclass
+from collections import deque
+from typing import ClassVar, Tuple, Optional, List
 from enum import Enum
 
+from .projectile_kernels import (EXPIRED, GROUND_IMPACT, IN_FLIGHT, XY_MAX, XY_MIN,
+                                 Z_MIN, flight_time, impact_time)
+
 
 class ProjectileState(Enum):
     """Lifecycle state of a projectile."""
@@ -22,42 +27,351 @@ class ProjectileState(Enum):
     EXPIRED = "expired"  # Out of bounds or too old
 
 
-@dataclass
+# Kernel outcome codes double as the pool's state column; terrain impacts
+# are only produced by the scalar Projectile.step
+TERRAIN_IMPACT = 3
+_STATE_BY_CODE = {
+    IN_FLIGHT: ProjectileState.IN_FLIGHT,
+    GROUND_IMPACT: ProjectileState.GROUND_IMPACT,
+    EXPIRED: ProjectileState.EXPIRED,
+    TERRAIN_IMPACT: ProjectileState.TERRAIN_IMPACT,
+}
+_CODE_BY_STATE = {state: code for code, state in _STATE_BY_CODE.items()}
+
+
+class ProjectilePool:
+    """
+    Structure-of-arrays storage for projectile state.
+    
+    Each projectile is one row across contiguous NumPy columns, so batched
+    integration reads whole columns instead of chasing per-object floats.
+    Projectile objects are views onto rows. Columns grow by doubling, and
+    released rows go on a free-list that allocate() draws from first.
+    """
+    
+    # Launch state is stored in single precision, like World's agent
+    # buffers; arithmetic on it is done in double precision. The flight
+    # clock accumulates dt every step and the frozen impact state is
+    # inverted by sample_trajectory, so both stay double.
+    FLOAT_COLUMNS = ('x0', 'y0', 'z0', 'vx', 'vy', 'vz', 'gravity')
+    FLOAT_DTYPE = np.float32
+    INT_COLUMNS = ('projectile_id', 'launcher_id', 'team')
+    
+    def __init__(self, capacity: int = 256):
+        self.capacity = 0
+        self.size = 0  # Rows ever handed out (high-water mark)
+        self._free: List[int] = []
+        self._resize(max(capacity, 1))
+    
+    def _resize(self, capacity: int):
+        """Reallocate every column with room for capacity rows."""
+        def grown(old, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:len(old)] = old
+            return new
+        
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, grown(getattr(self, name, None), capacity, self.FLOAT_DTYPE))
+        self.t_alive = grown(getattr(self, 't_alive', None), capacity, np.float64)
+        for name in self.INT_COLUMNS:
+            setattr(self, name, grown(getattr(self, name, None), capacity, np.int64))
+        self.state = grown(getattr(self, 'state', None), capacity, np.int8)
+        self.has_impact = grown(getattr(self, 'has_impact', None), capacity, bool)
+        self.impact_pos = grown(getattr(self, 'impact_pos', None), (capacity, 3), np.float64)
+        self.impact_vel = grown(getattr(self, 'impact_vel', None), (capacity, 3), np.float64)
+        self.capacity = capacity
+    
+    def _take_rows(self, k: int) -> np.ndarray:
+        """Hand out k rows, reusing released ones before growing."""
+        n_reused = min(k, len(self._free))
+        reused = [self._free.pop() for _ in range(n_reused)]
+        start = self.size
+        self.size += k - n_reused
+        if self.size > self.capacity:
+            self._resize(max(self.size, 2 * self.capacity))
+        return np.concatenate((np.array(reused, dtype=np.int64),
+                               np.arange(start, self.size, dtype=np.int64)))
+    
+    def allocate(self, projectile_id: int, launcher_id: int, team: int,
+                 x0: float, y0: float, z0: float,
+                 vx: float, vy: float, vz: float, gravity: float = 9.81) -> int:
+        """
+        Store one freshly launched projectile.
+        
+        Returns:
+            Row index of the projectile
+        """
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self.size
+            self.size += 1
+            if self.size > self.capacity:
+                self._resize(2 * self.capacity)
+        self.projectile_id[row] = projectile_id
+        self.launcher_id[row] = launcher_id
+        self.team[row] = team
+        self.x0[row] = x0
+        self.y0[row] = y0
+        self.z0[row] = z0
+        self.vx[row] = vx
+        self.vy[row] = vy
+        self.vz[row] = vz
+        self.gravity[row] = gravity
+        self.t_alive[row] = 0.0
+        self.state[row] = IN_FLIGHT
+        self.has_impact[row] = False
+        return row
+    
+    def allocate_batch(self, projectile_ids, launcher_ids, teams,
+                       x0, y0, z0, vx, vy, vz, gravity=9.81) -> np.ndarray:
+        """
+        Store k freshly launched projectiles with one assignment per column.
+        
+        Arguments are (k,) arrays or scalars broadcast to all k rows.
+        
+        Returns:
+            (k,) row indices, in argument order
+        """
+        rows = self._take_rows(len(projectile_ids))
+        self.projectile_id[rows] = projectile_ids
+        self.launcher_id[rows] = launcher_ids
+        self.team[rows] = teams
+        self.x0[rows] = x0
+        self.y0[rows] = y0
+        self.z0[rows] = z0
+        self.vx[rows] = vx
+        self.vy[rows] = vy
+        self.vz[rows] = vz
+        self.gravity[rows] = gravity
+        self.t_alive[rows] = 0.0
+        self.state[rows] = IN_FLIGHT
+        self.has_impact[rows] = False
+        return rows
+    
+    def adopt(self, proj: "Projectile"):
+        """
+        Copy a projectile's row into this pool and rebind the view to it.
+        
+        A standalone projectile's scratch row is released once copied.
+        """
+        src, r = proj._pool, proj._row
+        if src is self:
+            return
+        row = self.allocate(src.projectile_id[r], src.launcher_id[r], src.team[r],
+                            src.x0[r], src.y0[r], src.z0[r],
+                            src.vx[r], src.vy[r], src.vz[r], src.gravity[r])
+        self.t_alive[row] = src.t_alive[r]
+        self.state[row] = src.state[r]
+        self.has_impact[row] = src.has_impact[r]
+        self.impact_pos[row] = src.impact_pos[r]
+        self.impact_vel[row] = src.impact_vel[r]
+        proj._pool, proj._row = self, row
+        if src is _SCRATCH_POOL:
+            src.release(r)
+    
+    def release(self, rows):
+        """Return rows to the free-list for reuse by later allocations."""
+        self._free.extend(np.atleast_1d(rows).tolist())
+    
+    def clear(self):
+        """Forget every row, keeping the allocated capacity."""
+        self.size = 0
+        self._free.clear()
+    
+    def view(self, row: int) -> "Projectile":
+        """Projectile object backed by one row of this pool."""
+        return Projectile._bind(self, row)
+    
+    def position_all(self, rows=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Current positions of many projectiles at once.
+        
+        Impacted projectiles report their frozen impact point, as in
+        Projectile.position().
+        
+        Args:
+            rows: Row indices to evaluate (default: every row handed out)
+        
+        Returns:
+            (x, y, z) arrays
+        """
+        if rows is None:
+            rows = slice(0, self.size)
+        t = self.t_alive[rows]
+        x = self.x0[rows] + self.vx[rows] * t
+        y = self.y0[rows] + self.vy[rows] * t
+        z = self.z0[rows] + self.vz[rows] * t - 0.5 * self.gravity[rows] * t * t
+        hit = self.has_impact[rows]
+        if hit.any():
+            impact = self.impact_pos[rows][hit]
+            x[hit], y[hit], z[hit] = impact.T
+        return x, y, z
+    
+    def velocity_all(self, rows=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Current velocities of many projectiles; see position_all()."""
+        if rows is None:
+            rows = slice(0, self.size)
+        vx = self.vx[rows].astype(np.float64)
+        vy = self.vy[rows].astype(np.float64)
+        vz = self.vz[rows] - self.gravity[rows] * self.t_alive[rows]
+        hit = self.has_impact[rows]
+        if hit.any():
+            impact = self.impact_vel[rows][hit]
+            vx[hit], vy[hit], vz[hit] = impact.T
+        return vx, vy, vz
+
+
+# Backing rows of standalone Projectiles, shared so constructing one does
+# not allocate a pool per instance. Rows return to the free-list when the
+# projectile is adopted into another pool or garbage collected.
+_SCRATCH_POOL = ProjectilePool()
+
+
+def _column_property(column: str, kind):
+    """Property reading and writing one pool column at the view's row."""
+    def fget(self):
+        return kind(getattr(self._pool, column)[self._row])
+    
+    def fset(self, value):
+        getattr(self._pool, column)[self._row] = value
+    
+    return property(fget, fset)
+
+
 class Projectile:
     """
-    Single projectile instance with full ballistic state.
+    Single projectile, viewed as one row of a ProjectilePool.
     
-    All units in SI (meters, seconds, m/s).
+    Constructing a Projectile directly stores it in a shared scratch pool;
+    World.add_projectile moves it into the world's pool. All units in SI
+    (meters, seconds, m/s).
     """
     
-    projectile_id: int
-    launcher_id: int  # Agent ID who launched
-    launcher_team: int  # Team of launcher (for friendly fire tracking)
+    __slots__ = ('_pool', '_row', 'trajectory')
+    
+    # Append every integrated position to trajectory. Off by default: the
+    # path is analytic, so sample_trajectory() can rebuild it on demand
+    record_trajectory: ClassVar[bool] = False
+    
+    projectile_id = _column_property('projectile_id', int)
+    launcher_id = _column_property('launcher_id', int)  # Agent ID who launched
+    launcher_team = _column_property('team', int)  # Team of launcher (for friendly fire tracking)
     
     # Initial conditions (at spawn)
-    x0: float
-    y0: float
-    z0: float
-    vx: float  # Initial velocity x-component
-    vy: float  # Initial velocity y-component
-    vz: float  # Initial velocity z-component
-    
-    # Gravity and environment
-    gravity: float = 9.81  # m/s^2
-    
-    # State tracking
-    time_alive: float = 0.0  # Cumulative integration time
-    state: ProjectileState = ProjectileState.IN_FLIGHT
-    
-    # Trajectory history (for visualization)
-    trajectory: List[Tuple[float, float, float]] = None  # [(x, y, z), ...]
-    impact_pos: Optional[Tuple[float, float, float]] = None  # Where it hit
-    impact_velocity: Optional[Tuple[float, float, float]] = None  # Velocity at impact
-    
-    def __post_init__(self):
-        """Initialize trajectory history."""
-        if self.trajectory is None:
-            self.trajectory = [(self.x0, self.y0, self.z0)]
+    x0 = _column_property('x0', float)
+    y0 = _column_property('y0', float)
+    z0 = _column_property('z0', float)
+    vx = _column_property('vx', float)  # Initial velocity x-component
+    vy = _column_property('vy', float)  # Initial velocity y-component
+    vz = _column_property('vz', float)  # Initial velocity z-component
+    gravity = _column_property('gravity', float)  # m/s^2
+    time_alive = _column_property('t_alive', float)  # Cumulative integration time
+    
+    def __init__(self, projectile_id: int, launcher_id: int, launcher_team: int,
+                 x0: float, y0: float, z0: float,
+                 vx: float, vy: float, vz: float, gravity: float = 9.81,
+                 time_alive: float = 0.0,
+                 state: ProjectileState = ProjectileState.IN_FLIGHT,
+                 trajectory: Optional[List[Tuple[float, float, float]]] = None,
+                 impact_pos: Optional[Tuple[float, float, float]] = None,
+                 impact_velocity: Optional[Tuple[float, float, float]] = None):
+        self._pool = _SCRATCH_POOL
+        self._row = self._pool.allocate(projectile_id, launcher_id, launcher_team,
+                                        x0, y0, z0, vx, vy, vz, gravity)
+        # allocate() already stored the launch defaults
+        if time_alive:
+            self.time_alive = time_alive
+        if state is not ProjectileState.IN_FLIGHT:
+            self.state = state
+        if impact_pos is not None:
+            self.impact_pos = impact_pos
+        if impact_velocity is not None:
+            self.impact_velocity = impact_velocity
+        # Trajectory history, only kept when record_trajectory is set
+        self.trajectory = trajectory
+        if trajectory is None and self.record_trajectory:
+            self.trajectory = [(x0, y0, z0)]
+    
+    @classmethod
+    def _bind(cls, pool: ProjectilePool, row: int) -> "Projectile":
+        """View onto an already allocated row of pool."""
+        proj = cls.__new__(cls)
+        proj._pool = pool
+        proj._row = row
+        proj.trajectory = None
+        if cls.record_trajectory:
+            proj.trajectory = [(pool.x0[row].item(), pool.y0[row].item(), pool.z0[row].item())]
+        return proj
+    
+    def __del__(self):
+        # Views of other pools leave their rows to the pool's owner
+        pool = getattr(self, '_pool', None)
+        if pool is not None and pool is _SCRATCH_POOL:
+            pool.release(self._row)
+    
+    def __repr__(self) -> str:
+        return (f"Projectile(projectile_id={self.projectile_id}, "
+                f"launcher_id={self.launcher_id}, state={self.state})")
+    
+    @property
+    def state(self) -> ProjectileState:
+        return _STATE_BY_CODE[self._pool.state[self._row].item()]
+    
+    @state.setter
+    def state(self, value: ProjectileState):
+        self._pool.state[self._row] = _CODE_BY_STATE[value]
+    
+    @property
+    def impact_pos(self) -> Optional[Tuple[float, float, float]]:
+        """Where it hit, or None."""
+        if not self._pool.has_impact[self._row]:
+            return None
+        return tuple(self._pool.impact_pos[self._row].tolist())
+    
+    @impact_pos.setter
+    def impact_pos(self, value: Optional[Tuple[float, float, float]]):
+        self._pool.has_impact[self._row] = value is not None
+        if value is not None:
+            self._pool.impact_pos[self._row] = value
+    
+    @property
+    def impact_velocity(self) -> Optional[Tuple[float, float, float]]:
+        """Velocity at impact, or None."""
+        if not self._pool.has_impact[self._row]:
+            return None
+        return tuple(self._pool.impact_vel[self._row].tolist())
+    
+    @impact_velocity.setter
+    def impact_velocity(self, value: Optional[Tuple[float, float, float]]):
+        if value is not None:
+            self._pool.impact_vel[self._row] = value
+    
+    def reset(self, projectile_id: int, launcher_id: int, launcher_team: int,
+              x0: float, y0: float, z0: float,
+              vx: float, vy: float, vz: float, gravity: float = 9.81):
+        """
+        Reinitialize this projectile in place for reuse from a pool.
+        
+        When recording, the trajectory list is cleared and reused rather
+        than reallocated.
+        """
+        pool = self._pool
+        pool.release(self._row)
+        self._row = pool.allocate(projectile_id, launcher_id, launcher_team,
+                                  x0, y0, z0, vx, vy, vz, gravity)
+        self._restart_trajectory(x0, y0, z0)
+    
+    def _restart_trajectory(self, x0: float, y0: float, z0: float):
+        """Start a fresh trajectory at the launch point when recording."""
+        if self.record_trajectory:
+            if self.trajectory is None:
+                self.trajectory = []
+            self.trajectory.clear()
+            self.trajectory.append((x0, y0, z0))
+        else:
+            self.trajectory = None
     
     def position(self) -> Tuple[float, float, float]:
         """Get current position (x, y, z)."""
@@ -100,14 +414,20 @@ class Projectile:
         if self.state != ProjectileState.IN_FLIGHT:
             return False
         
-        # Record old position
-        old_x, old_y, old_z = self.position()
+        # Launch state read once from the pool row
+        x0, y0, z0 = self.x0, self.y0, self.z0
+        vx, vy, vz, g = self.vx, self.vy, self.vz, self.gravity
         
-        # Integrate time
-        self.time_alive += dt
+        # Old height (only z is needed for the crossing test)
+        t_prev = self.time_alive
+        old_z = z0 + vz * t_prev - 0.5 * g * t_prev * t_prev
         
-        # Get new position
-        new_x, new_y, new_z = self.position()
+        # Integrate time and evaluate the new position
+        t = t_prev + dt
+        self.time_alive = t
+        new_x = x0 + vx * t
+        new_y = y0 + vy * t
+        new_z = z0 + vz * t - 0.5 * g * t * t
         
         # Determine ground level at impact location
         if terrain_height_func is not None:
@@ -128,92 +448,131 @@ class Projectile:
             impact_time = self._compute_impact_time(old_z, ground_z, dt)
             
             # Set impact position
-            t_impact = self.time_alive - dt + impact_time
-            x_impact = self.x0 + self.vx * t_impact
-            y_impact = self.y0 + self.vy * t_impact
+            t_impact = t - dt + impact_time
+            x_impact = x0 + vx * t_impact
+            y_impact = y0 + vy * t_impact
             self.impact_pos = (x_impact, y_impact, ground_z)
             
             # Set impact velocity (frozen at moment of impact)
-            vx_impact = self.vx
-            vy_impact = self.vy
-            vz_impact = self.vz - self.gravity * t_impact
-            self.impact_velocity = (vx_impact, vy_impact, vz_impact)
+            vz_impact = vz - g * t_impact
+            self.impact_velocity = (vx, vy, vz_impact)
             
             # Add impact point to trajectory
-            self.trajectory.append(self.impact_pos)
+            if self.record_trajectory:
+                self.trajectory.append(self.impact_pos)
             
             # Mark as impacted
             self.state = ProjectileState.GROUND_IMPACT
             return False
         
         # Add current position to trajectory
-        self.trajectory.append((new_x, new_y, new_z))
+        if self.record_trajectory:
+            self.trajectory.append((new_x, new_y, new_z))
         
         # Check bounds (out of map)
         # Assume 0-100m in x and y (parameterize later)
-        if (new_x < -10 or new_x > 110 or new_y < -10 or new_y > 110 or
-                new_z < -50):  # Projectile went way underground
+        if (new_x < XY_MIN or new_x > XY_MAX or new_y < XY_MIN or new_y > XY_MAX or
+                new_z < Z_MIN):  # Projectile went way underground
             self.state = ProjectileState.EXPIRED
             return False
         
         return True
     
-    def _compute_impact_time(self, old_z: float, ground_z: float, dt: float) -> float:
+    def sample_trajectory(self, n_points: int = 50) -> np.ndarray:
         """
-        Compute exact impact time within step [0, dt].
+        Evaluate the flight path so far at n_points evenly spaced times.
+        
+        Replaces the recorded trajectory for rendering: positions come from
+        the closed-form ballistic equations, ending at the impact point for
+        impacted projectiles.
+        
+        Returns:
+            (n_points, 3) array of (x, y, z)
+        """
+        t_end = self.time_alive
+        if (self.state == ProjectileState.GROUND_IMPACT and
+                self.impact_velocity is not None and self.gravity > 0):
+            # vz_impact = vz - g * t_impact
+            t_end = (self.vz - self.impact_velocity[2]) / self.gravity
+        t = np.linspace(0.0, t_end, n_points)
+        return np.column_stack((
+            self.x0 + self.vx * t,
+            self.y0 + self.vy * t,
+            self.z0 + self.vz * t - 0.5 * self.gravity * t * t,
+        ))
+    
+    def precompute_trajectory(self, dt: float) -> np.ndarray:
+        """
+        Positions repeated step(dt) calls would record, in one vector pass.
         
-        Solves: z(t) = z0 + vz*t - 0.5*g*t^2 = ground_z
-        Rearrange: -0.5*g*t^2 + vz*t + (z0 - ground_z) = 0
+        Flat ground only. Sample times are accumulated exactly as step()
+        accumulates time_alive, so the rows match a recorded trajectory
+        bit for bit, ending at the impact point for ground impacts or at
+        the first out-of-bounds position. The projectile is not advanced.
         
-        Uses quadratic formula, returns t in [0, dt].
+        Returns:
+            (k, 3) array of (x, y, z), starting at the current position
+        
+        Raises:
+            ValueError: if the flight never ends
         """
-        # At start of step: z = old_z, vz from previous step
-        # We need to be careful: time_alive already advanced
-        # So we solve relative to step start
+        if self.state != ProjectileState.IN_FLIGHT:
+            return np.array([self.position()])
         
-        # vz at step start
-        t_step_start = self.time_alive - dt
-        vz_start = self.vz - self.gravity * t_step_start
+        x0, y0, z0 = self.x0, self.y0, self.z0
+        vx, vy, vz, g = self.vx, self.vy, self.vz, self.gravity
+        t_now = self.time_alive
         
-        # Quadratic: -0.5*g*t^2 + vz_start*t + (old_z - ground_z) = 0
-        a = -0.5 * self.gravity
-        b = vz_start
-        c = old_z - ground_z
+        # Analytic end of flight: sinking below Z_MIN or leaving the XY box,
+        # whichever is first (ground impact, if any, comes before either)
+        t_end = flight_time(z0 - Z_MIN, vz, g)
+        for p0, v in ((x0, vx), (y0, vy)):
+            if v != 0:
+                t_end = min(t_end, ((XY_MAX if v > 0 else XY_MIN) - p0) / v)
+        if t_end == math.inf:
+            raise ValueError("projectile never lands or leaves the arena")
         
-        discriminant = b * b - 4 * a * c
-        if discriminant < 0:
-            # No real solution (shouldn't happen if we detected impact)
-            return dt
+        n = max(int(math.ceil((t_end - t_now) / dt)), 0) + 2
+        while True:
+            ts = np.add.accumulate(np.concatenate(([t_now], np.full(n, dt))))
+            xs = x0 + vx * ts
+            ys = y0 + vy * ts
+            zs = z0 + vz * ts - 0.5 * g * ts * ts
+            old_z, new_z = zs[:-1], zs[1:]
+            hit = (new_z <= 0.0) & (old_z > 0.0)
+            out = ((xs[1:] < XY_MIN) | (xs[1:] > XY_MAX) | (ys[1:] < XY_MIN) |
+                   (ys[1:] > XY_MAX) | (new_z < Z_MIN))
+            ends = np.flatnonzero(hit | out)
+            if ends.size:
+                break
+            n *= 2
         
-        t1 = (-b + np.sqrt(discriminant)) / (2 * a)
-        t2 = (-b - np.sqrt(discriminant)) / (2 * a)
+        e = ends[0]
+        path = np.column_stack((xs[:e + 2], ys[:e + 2], zs[:e + 2]))
+        if hit[e]:
+            # Same impact solve as step()
+            t = ts[e + 1]
+            t_impact = t - dt + impact_time(old_z[e], 0.0, vz - g * (t - dt), g, dt)
+            path[-1] = (x0 + vx * t_impact, y0 + vy * t_impact, 0.0)
+        return path
+    
+    def _compute_impact_time(self, old_z: float, ground_z: float, dt: float) -> float:
+        """
+        Compute exact impact time within step [0, dt].
         
-        # Choose positive root closest to 0
-        valid_times = [t for t in [t1, t2] if 0 <= t <= dt]
-        if valid_times:
-            return min(valid_times)
-        else:
-            # Fallback: return dt (shouldn't happen)
-            return dt
+        Solves: z(t) = z0 + vz*t - 0.5*g*t^2 = ground_z relative to the
+        start of the step (time_alive has already been advanced), via the
+        compiled impact_time kernel.
+        """
+        # vz at step start
+        t_step_start = self.time_alive - dt
+        vz_start = self.vz - self.gravity * t_step_start
+        return impact_time(old_z, ground_z, vz_start, self.gravity, dt)
     
     def flight_time_to_impact(self) -> float:
         """Compute time to ground impact (ignoring terrain)."""
         # Solve: z(t) = z0 + vz*t - 0.5*g*t^2 = 0
-        # -0.5*g*t^2 + vz*t + z0 = 0
-        a = -0.5 * self.gravity
-        b = self.vz
-        c = self.z0
-        
-        discriminant = b * b - 4 * a * c
-        if discriminant < 0:
-            return float('inf')  # Never hits
-        
-        t1 = (-b + np.sqrt(discriminant)) / (2 * a)
-        t2 = (-b - np.sqrt(discriminant)) / (2 * a)
-        
-        # Return positive root (launched upward: t1 is later impact)
-        valid = [t for t in [t1, t2] if t > 0]
-        return min(valid) if valid else float('inf')
+        return flight_time(self.z0, self.vz, self.gravity)
     
     def range_on_level_ground(self) -> float:
         """
@@ -225,16 +584,46 @@ class Projectile:
         if t_flight == float('inf'):
             return 0.0
         
-        v_horiz = np.sqrt(self.vx * self.vx + self.vy * self.vy)
+        v_horiz = math.sqrt(self.vx * self.vx + self.vy * self.vy)
         return v_horiz * t_flight
 
 
 class ProjectileFactory:
-    """Factory for creating projectiles with canonical parameters."""
+    """
+    Factory for creating projectiles with canonical parameters.
+    
+    Launched projectiles are rows of self.pool. Projectiles handed back via
+    recycle() release their row and are kept on a free-list, so later
+    launches rebind the same objects instead of allocating new ones.
+    """
     
-    def __init__(self, gravity: float = 9.81):
+    def __init__(self, gravity: float = 9.81, pool: Optional[ProjectilePool] = None):
         self.gravity = gravity
+        self.pool = pool if pool is not None else ProjectilePool()
         self._next_id = 0
+        self._free: deque = deque()
+    
+    def recycle(self, proj: Projectile):
+        """Return a finished projectile to the free-list for reuse."""
+        proj._pool.release(proj._row)
+        # Unbound until _acquire rebinds it, so the released row is not
+        # released again when the object is collected
+        proj._pool, proj._row = self.pool, -1
+        self._free.append(proj)
+    
+    def _acquire(self, launcher_id: int, launcher_team: int,
+                 x0: float, y0: float, z0: float,
+                 vx: float, vy: float, vz: float) -> Projectile:
+        """Write a new row with this state and return a (pooled) view of it."""
+        row = self.pool.allocate(self._next_id, launcher_id, launcher_team,
+                                 x0, y0, z0, vx, vy, vz, self.gravity)
+        self._next_id += 1
+        if not self._free:
+            return self.pool.view(row)
+        proj = self._free.pop()
+        proj._pool, proj._row = self.pool, row
+        proj._restart_trajectory(x0, y0, z0)
+        return proj
     
     def launch(self, launcher_id: int, launcher_team: int,
                x0: float, y0: float, z0: float,
@@ -254,20 +643,13 @@ class ProjectileFactory:
             Projectile instance
         """
         # Convert polar to cartesian
-        vx = speed * np.cos(loft_angle) * np.cos(azimuth)
-        vy = speed * np.cos(loft_angle) * np.sin(azimuth)
-        vz = speed * np.sin(loft_angle)
-        
-        proj = Projectile(
-            projectile_id=self._next_id,
-            launcher_id=launcher_id,
-            launcher_team=launcher_team,
-            x0=x0, y0=y0, z0=z0,
-            vx=vx, vy=vy, vz=vz,
-            gravity=self.gravity
-        )
-        self._next_id += 1
-        return proj
+        horizontal = speed * math.cos(loft_angle)
+        vx = horizontal * math.cos(azimuth)
+        vy = horizontal * math.sin(azimuth)
+        vz = speed * math.sin(loft_angle)
+        
+        return self._acquire(launcher_id, launcher_team,
+                             x0, y0, z0, vx, vy, vz)
     
     def launch_cartesian(self, launcher_id: int, launcher_team: int,
                          x0: float, y0: float, z0: float,
@@ -283,13 +665,39 @@ class ProjectileFactory:
         Returns:
             Projectile instance
         """
-        proj = Projectile(
-            projectile_id=self._next_id,
-            launcher_id=launcher_id,
-            launcher_team=launcher_team,
-            x0=x0, y0=y0, z0=z0,
-            vx=vx, vy=vy, vz=vz,
-            gravity=self.gravity
-        )
-        self._next_id += 1
-        return proj
+        return self._acquire(launcher_id, launcher_team,
+                             x0, y0, z0, vx, vy, vz)
+    
+    def launch_batch(self, launcher_ids, launcher_teams, x0, y0, z0,
+                     vx, vy, vz) -> List[Projectile]:
+        """
+        Create k projectiles with direct cartesian velocities at once.
+        
+        All k rows are written into the pool with one assignment per
+        column; recycled Projectile objects are rebound to the new rows
+        before any new ones are created.
+        
+        Args:
+            launcher_ids, launcher_teams: (k,) origin info
+            x0, y0, z0: (k,) launch positions, or scalars shared by all
+            vx, vy, vz: (k,) velocity components
+        
+        Returns:
+            List of k Projectile instances, in argument order
+        """
+        k = len(launcher_ids)
+        ids = np.arange(self._next_id, self._next_id + k)
+        rows = self.pool.allocate_batch(ids, launcher_ids, launcher_teams,
+                                        x0, y0, z0, vx, vy, vz, self.gravity)
+        self._next_id += k
+        
+        new = []
+        for row in rows.tolist():
+            if self._free:
+                proj = self._free.pop()
+                proj._pool, proj._row = self.pool, row
+                proj._restart_trajectory(proj.x0, proj.y0, proj.z0)
+            else:
+                proj = self.pool.view(row)
+            new.append(proj)
+        return new
@@ -7,11 +7,24 @@ adjacent cells. This reduces average-case complexity dramatically.
 
 Grid structure:
 - Arena divided into N×N cells
-- Each cell tracks agents within it
+- Each cell holds a doubly linked list of its agent rows. Rebuilding
+  only relinks the agents whose cell changed since the last build, so
+  its cost does not depend on the number of cells
+- A CSR view (a counting sort of the cell ids into contiguous per-cell
+  runs, delimited by per-cell offsets) is derived on demand for point
+  queries and statistics
+- All buffers are preallocated and grown geometrically, so building the
+  grid and emitting pairs allocate nothing in steady state
 - For collision detection, check only 9 cells (3×3 neighborhood)
 """
 import numpy as np
-from typing import List, Tuple, Dict, Set
+from typing import Tuple
+
+from .kernels import bucket_by_cell, grid_neighbor_pairs, relink_cells
+
+# Upper bound on grid cells for collision_cell_size; keeps the int32 cell
+# list heads within 256 KB and the int64 CSR offsets within 512 KB
+MAX_GRID_CELLS = 1 << 16
 
 
 class SpatialGrid:
@@ -30,16 +43,22 @@ class SpatialGrid:
         """
         self.arena_width = arena_width
         self.arena_height = arena_height
-        self.cell_size = cell_size
-
-        # Grid dimensions
-        self.grid_width = int(np.ceil(arena_width / cell_size))
-        self.grid_height = int(np.ceil(arena_height / cell_size))
 
-        # Grid cells: grid[row][col] = set of agent ids
-        self.grid: Dict[Tuple[int, int], Set[int]] = {}
-
-        # Statistics for performance analysis
+        # Per-agent buffers (cell of each row, cell-list links, CSR
+        # payload) and pair buffers, grown on demand
+        self._cell_of = np.full(64, -1, dtype=np.int64)
+        self._next = np.full(64, -1, dtype=np.int32)
+        self._prev = np.full(64, -1, dtype=np.int32)
+        self._rows = np.empty(64, dtype=np.int64)
+        self._ia = np.empty(256, dtype=np.int32)
+        self._ib = np.empty(256, dtype=np.int32)
+
+        # Grid dimensions and the (empty) CSR buckets
+        self.set_cell_size(cell_size)
+
+        # Statistics for performance analysis. Collection is off by default
+        # so production stepping does not pay for the bookkeeping.
+        self.stats_enabled = False
         self.stats_pairs_checked = 0
         self.stats_pairs_colliding = 0
         self.stats_cells_occupied = 0
@@ -49,25 +68,91 @@ class SpatialGrid:
             f"({self.grid_width * self.grid_height} cells)")
         print(f"[SpatialGrid] Cell size: {cell_size}m")
 
-    def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
-        """Get grid cell coordinates for a position."""
-        col = int(np.clip(x / self.cell_size, 0, self.grid_width - 1))
-        row = int(np.clip(y / self.cell_size, 0, self.grid_height - 1))
-        return (row, col)
+    def set_cell_size(self, cell_size: float):
+        """Change the cell size, recomputing grid dimensions.
 
-    def insert(self, agent_id: int, x: float, y: float):
-        """Insert agent into grid at position (x, y)."""
-        cell = self._get_cell(x, y)
-        if cell not in self.grid:
-            self.grid[cell] = set()
-        self.grid[cell].add(agent_id)
+        Clears the grid.
+        """
+        self.cell_size = cell_size
+        self.grid_width = int(np.ceil(self.arena_width / cell_size))
+        self.grid_height = int(np.ceil(self.arena_height / cell_size))
+        n_cells = self.grid_width * self.grid_height
+        self._head = np.full(n_cells, -1, dtype=np.int32)
+        self._cell_starts = np.zeros(n_cells + 1, dtype=np.int64)
+        self._cursor = np.empty(n_cells, dtype=np.int64)
+        self.clear()
+
+    def _ensure_capacity(self, n: int):
+        """Grow the per-agent buffers (at least doubling) to hold n rows."""
+        capacity = len(self._cell_of)
+        if n <= capacity:
+            return
+        capacity = max(n, 2 * capacity)
+        for name in ('_cell_of', '_next', '_prev'):
+            old = getattr(self, name)
+            grown = np.full(capacity, -1, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+        self._rows = np.empty(capacity, dtype=np.int64)
+
+    def build(self, xy: np.ndarray, alive: np.ndarray):
+        """Bucket the living rows of an agent position array by cell.
+
+        Only rows whose cell (or -1 for dead rows) differs from the last
+        build are relinked, so the cost is one compiled pass over the
+        agents plus O(1) per agent that crossed a cell boundary.
+
+        Args:
+            xy: (n, 2) agent positions
+            alive: (n,) bool mask of the rows to insert
+        """
+        n = len(alive)
+        if n < self._n:
+            # Rows past n were removed from the world; start over
+            self.clear()
+        self._ensure_capacity(n)
+        moved = relink_cells(xy, alive, self.cell_size, self.grid_width, self.grid_height,
+                             self._cell_of[:n], self._head, self._next, self._prev)
+        if moved or n != self._n:
+            self._csr_stale = True
+        self._n = n
 
     def clear(self):
         """Clear grid for next timestep."""
-        self.grid.clear()
+        self._cell_of.fill(-1)
+        self._head.fill(-1)
+        self._n = 0
+        self._cell_starts.fill(0)
+        self._csr_rows = self._rows[:0]
+        self._csr_stale = False
+
+    def _refresh_csr(self):
+        """Rebuild the CSR view from the cell of each row if it is stale."""
+        if self._csr_stale:
+            k = bucket_by_cell(self._cell_of[:self._n], self._cell_starts,
+                               self._cursor, self._rows)
+            self._csr_rows = self._rows[:k]
+            self._csr_stale = False
+
+    @property
+    def cell_starts(self) -> np.ndarray:
+        """(n_cells + 1,) CSR offsets of each cell's run in rows."""
+        self._refresh_csr()
+        return self._cell_starts
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Gridded agent rows ordered by cell, ascending within each cell.
+
+        Rows of cell c = row * grid_width + col are
+        rows[cell_starts[c]:cell_starts[c + 1]]. The array views an
+        internal buffer that is rewritten once the grid changes.
+        """
+        self._refresh_csr()
+        return self._csr_rows
 
-    def get_neighbors(self, x: float, y: float, radius: float = 0) -> Set[int]:
-        """Get all agent IDs in cells adjacent to position (x, y).
+    def get_neighbors(self, x: float, y: float, radius: float = 0) -> np.ndarray:
+        """Get all agent rows in cells adjacent to position (x, y).
 
         Checks 3×3 grid of cells (center + 8 neighbors).
 
@@ -76,90 +161,56 @@ class SpatialGrid:
             radius: Extra buffer radius (added to search area)
 
         Returns:
-            Set of agent IDs in neighboring cells
+            int64 array of agent rows in neighboring cells
         """
-        row, col = self._get_cell(x, y)
-
-        neighbors = set()
-
-        # Check 3x3 grid (center + 8 adjacent)
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                check_row = row + dr
-                check_col = col + dc
-
-                # Bounds check
-                if (0 <= check_row < self.grid_height and
-                    0 <= check_col < self.grid_width):
-                    cell = (check_row, check_col)
-                    if cell in self.grid:
-                        neighbors.update(self.grid[cell])
-
-        return neighbors
-
-    def get_all_neighbor_pairs(self) -> List[Tuple[int, int]]:
+        # Scalar min/max: np.clip on a float costs more than the query
+        col = min(max(int(x / self.cell_size), 0), self.grid_width - 1)
+        row = min(max(int(y / self.cell_size), 0), self.grid_height - 1)
+
+        # Cells within one grid row of the block are contiguous in CSR order
+        c0 = max(col - 1, 0)
+        c1 = min(col + 1, self.grid_width - 1)
+        starts = self.cell_starts
+        return np.concatenate([
+            self.rows[starts[r * self.grid_width + c0]:starts[r * self.grid_width + c1 + 1]]
+            for r in range(max(row - 1, 0), min(row + 1, self.grid_height - 1) + 1)])
+
+    def get_all_neighbor_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
         """Get all unique pairs of agents that could potentially collide.
 
         This is the broad-phase collision detection. Returns pairs of
-        agents in the same or adjacent cells.
+        agents in the same or adjacent cells, emitted by a compiled pass
+        over the cell lists straight into preallocated arrays.
 
-        Assumes grid has already been built with insert() calls.
+        Assumes grid has already been built with build().
 
         Returns:
-            List of (agent_id_a, agent_id_b) pairs where a < b
+            (ia, ib) int32 arrays of (row_a, row_b) pairs with row_a < row_b,
+            sorted lexicographically (the order of a nested i < j loop).
+            They view internal buffers that the next call overwrites.
         """
-        pairs = set()
-        self.stats_cells_occupied = len(self.grid)
-        
-        # Iterate through each occupied cell
-        for (row, col), agent_ids in self.grid.items():
-            # Convert set to list for indexing
-            agent_list = list(agent_ids)
-            
-            # Pairs within this cell (all combinations)
-            for i in range(len(agent_list)):
-                for j in range(i + 1, len(agent_list)):
-                    a_id, b_id = agent_list[i], agent_list[j]
-                    pair = (min(a_id, b_id), max(a_id, b_id))
-                    pairs.add(pair)
-            
-            # Pairs with each neighboring cell (to avoid duplicate checking,
-            # only check cells with higher row/col indices)
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue  # Already handled above
-                    
-                    neighbor_row = row + dr
-                    neighbor_col = col + dc
-                    
-                    # Only process neighbors with row >= current row (to avoid duplicates)
-                    if neighbor_row < row or (neighbor_row == row and neighbor_col <= col):
-                        continue
-                    
-                    # Bounds check
-                    if not (0 <= neighbor_row < self.grid_height and
-                            0 <= neighbor_col < self.grid_width):
-                        continue
-                    
-                    neighbor_cell = (neighbor_row, neighbor_col)
-                    if neighbor_cell not in self.grid:
-                        continue
-                    
-                    neighbor_agent_list = list(self.grid[neighbor_cell])
-                    
-                    # All cross-pairs between this cell and neighbor
-                    for a_id in agent_list:
-                        for b_id in neighbor_agent_list:
-                            pair = (min(a_id, b_id), max(a_id, b_id))
-                            pairs.add(pair)
-
-        self.stats_pairs_checked = len(pairs)
-        return list(pairs)
+        cell_of = self._cell_of[:self._n]
+        while True:
+            total = grid_neighbor_pairs(cell_of, self._head, self._next,
+                                        self.grid_width, self.grid_height,
+                                        self._ia, self._ib)
+            if total <= len(self._ia):
+                break
+            capacity = max(total, 2 * len(self._ia))
+            self._ia = np.empty(capacity, dtype=np.int32)
+            self._ib = np.empty(capacity, dtype=np.int32)
+
+        if self.stats_enabled:
+            self.stats_cells_occupied = int(np.count_nonzero(np.diff(self.cell_starts)))
+            self.stats_pairs_checked = total
+        return self._ia[:total], self._ib[:total]
     
-    def record_collision(self):
-        """Called when a collision is actually processed."""
-        self.stats_pairs_colliding += 1
+    def record_collision(self, count: int = 1):
+        """Called when collisions are actually processed.
+
+        Callers should only invoke this while stats_enabled is set.
+        """
+        self.stats_pairs_colliding += count
     
     def reset_stats(self):
         """Reset collision counter for next step."""
@@ -167,13 +218,13 @@ class SpatialGrid:
 
     def stats(self) -> dict:
         """Return grid statistics."""
-        total_cells = self.grid_width * self.grid_height
-        occupied_cells = len(self.grid)
-        total_agents = sum(len(agents) for agents in self.grid.values())
+        counts = np.diff(self.cell_starts)
+        total_cells = counts.size
+        occupied_cells = int(np.count_nonzero(counts))
+        total_agents = int(counts.sum())
 
         avg_per_cell = total_agents / max(occupied_cells, 1)
-        max_per_cell = max((len(agents) for agents in self.grid.values()),
-                           default=0)
+        max_per_cell = int(counts.max()) if total_cells > 0 else 0
 
         return {
             'total_cells': total_cells,
@@ -216,29 +267,54 @@ def estimate_cell_size(
     return np.clip(cell_size, min_cell, max_cell)
 
 
+def collision_cell_size(
+        arena_width: float,
+        arena_height: float,
+        agent_radius: float = 0.3,
+        max_cells: int = MAX_GRID_CELLS) -> float:
+    """Smallest cell size that still finds every colliding pair.
+
+    Agents closer than 2 * agent_radius always land in the same or
+    adjacent cells, so the 3×3 neighborhood misses no collision. Smaller
+    cells mean fewer candidate pairs, which dominate grid cost in dense
+    formations; the cell size only grows past 2 * agent_radius when the
+    arena would otherwise need more than max_cells cells.
+
+    Args:
+        arena_width, arena_height: Arena dimensions
+        agent_radius: Agent radius
+        max_cells: Cap on grid_width * grid_height
+
+    Returns:
+        Cell size in meters
+    """
+    cell_size = 2 * agent_radius
+    while np.ceil(arena_width / cell_size) * np.ceil(arena_height / cell_size) > max_cells:
+        cell_size = max(cell_size * 1.05, np.sqrt(arena_width * arena_height / max_cells))
+    return float(cell_size)
+
+
 if __name__ == '__main__':
     # Simple test
     grid = SpatialGrid(arena_width=100, arena_height=100, cell_size=10)
 
     # Insert some agents
-    positions = {
-        0: (15, 15),
-        1: (18, 18),  # Close to 0
-        2: (50, 50),  # Far from others
-        3: (51, 51),  # Close to 2
-        4: (95, 95),  # Corner
-    }
-
-    for agent_id, (x, y) in positions.items():
-        grid.insert(agent_id, x, y)
+    positions = np.array([
+        (15, 15),
+        (18, 18),  # Close to 0
+        (50, 50),  # Far from others
+        (51, 51),  # Close to 2
+        (95, 95),  # Corner
+    ], dtype=float)
+    grid.build(positions, np.ones(len(positions), dtype=bool))
 
     # Get neighbors
     print("Neighbors of agent 0 (at 15, 15):", grid.get_neighbors(15, 15))
     print("Neighbors of agent 2 (at 50, 50):", grid.get_neighbors(50, 50))
 
     # Get all pairs
-    pairs = grid.get_all_neighbor_pairs(positions)
-    print(f"Potential collision pairs: {pairs}")
+    ia, ib = grid.get_all_neighbor_pairs()
+    print(f"Potential collision pairs: {list(zip(ia.tolist(), ib.tolist()))}")
 
     # Stats
     stats = grid.stats()
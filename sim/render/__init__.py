@@ -1,4 +1,5 @@
 """sim.render module."""
 from .renderer2d import Renderer2D
+from .video import VideoSink
 
-__all__ = ['Renderer2D']
+__all__ = ['Renderer2D', 'VideoSink']
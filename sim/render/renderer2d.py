@@ -3,61 +3,220 @@ Simple 2D rendering for Phase 1 evaluation and debugging.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
 from pathlib import Path
 from typing import List, Tuple
 
 from sim.core import World
+from sim.core.projectile_kernels import IN_FLIGHT
+from .video import VideoSink
+
+
+# Vertex angles, relative to heading, of the living-agent triangle
+# (tip, left corner, right corner)
+_TRIANGLE_ANGLES = np.array([0.0, 2.5, -2.5])
+# Vertex angles of the polygon drawn as a dead agent's circle
+_CIRCLE_ANGLES = np.linspace(0.0, 2 * np.pi, 16, endpoint=False)
+# RGBA of team 0 (blue) and every other team (red), indexed per agent
+# instead of handing matplotlib one color name per agent to parse
+_TEAM_RGBA = to_rgba_array(['blue', 'red'])
+
+
+def _polygons(centers: np.ndarray, radius: float, angles: np.ndarray) -> np.ndarray:
+    """
+    Vertices of polygons inscribed in circles around centers.
+    
+    Args:
+        centers: (N, 2) polygon centers
+        radius: circumscribed radius
+        angles: (K,) vertex angles shared by all polygons, or (N, K) per polygon
+    
+    Returns:
+        (N, K, 2) vertex array
+    """
+    angles = np.broadcast_to(angles, (len(centers), np.shape(angles)[-1]))
+    return np.stack([centers[:, 0, None] + radius * np.cos(angles),
+                     centers[:, 1, None] + radius * np.sin(angles)], axis=-1)
+
+
+def _arrow_segments(origins: np.ndarray, vectors: np.ndarray,
+                    head_width: float, head_length: float) -> np.ndarray:
+    """
+    Line segments of arrows drawn like Axes.arrow: a shaft along vector
+    with the head added beyond its end.
+    
+    Args:
+        origins: (N, 2) arrow tails
+        vectors: (N, 2) shaft vectors
+        head_width: full width of the arrow head
+        head_length: length of the arrow head
+    
+    Returns:
+        (3N, 2, 2) segments: shaft and the two head barbs of each arrow
+    """
+    length = np.hypot(vectors[:, 0], vectors[:, 1])[:, None]
+    unit = vectors / np.where(length > 0, length, 1.0)
+    normal = unit[:, ::-1] * [-1.0, 1.0]
+    base = origins + vectors
+    tip = base + head_length * unit
+    half = 0.5 * head_width * normal
+    segments = np.stack([
+        np.stack([origins, tip], axis=1),
+        np.stack([tip, base + half], axis=1),
+        np.stack([tip, base - half], axis=1),
+    ], axis=1)
+    return segments.reshape(-1, 2, 2)
+
+
+def _scene_arrays(world: World, frame_data: dict = None) -> dict:
+    """
+    Gather the drawn state as arrays from a frame_data snapshot or the live world.
+    
+    Returns:
+        dict of team, xy, heading, alive, vxy (None for snapshots without
+        agent velocities) and projectile pxy, pvxy, in_flight arrays
+    """
+    if frame_data is not None and isinstance(frame_data['agents'], dict):
+        # Columnar snapshot from World.snapshot_arrays()
+        agents, projs = frame_data['agents'], frame_data['projectiles']
+        return {
+            'team': agents['team'],
+            'xy': np.column_stack((agents['x'], agents['y'])),
+            'heading': agents['heading'],
+            'alive': agents['alive'],
+            'vxy': np.column_stack((agents['vx'], agents['vy'])) if 'vx' in agents else None,
+            'pxy': np.column_stack((projs['x'], projs['y'])),
+            'pvxy': np.column_stack((projs['vx'], projs['vy'])),
+            'in_flight': projs['in_flight'],
+        }
+    if frame_data is not None:
+        agents = frame_data['agents']
+        scene = {
+            'team': np.array([a['team'] for a in agents], dtype=np.int64),
+            'xy': np.array([(a['x'], a['y']) for a in agents], dtype=float).reshape(-1, 2),
+            'heading': np.array([a['heading'] for a in agents], dtype=float),
+            'alive': np.array([a['alive'] for a in agents], dtype=bool),
+            'vxy': None,
+        }
+        projectiles = [(p['x'], p['y'], p['vx'], p['vy'],
+                        p.get('state', 'in_flight') == 'in_flight')
+                       for p in frame_data['projectiles']]
+    else:
+        scene = {
+            'team': world.team,
+            'xy': world.xy,
+            'heading': world.heading,
+            'alive': world.alive,
+            'vxy': world.vxy,
+        }
+        # Projectile kinematics straight from the SoA columns
+        rows = world.projectile_rows
+        store = world.projectile_store
+        x, y, _ = store.position_all(rows)
+        vx, vy, _ = store.velocity_all(rows)
+        scene['pxy'] = np.column_stack((x, y))
+        scene['pvxy'] = np.column_stack((vx, vy))
+        scene['in_flight'] = store.state[rows] == IN_FLIGHT
+        return scene
+    
+    proj_arr = np.array(projectiles, dtype=float).reshape(-1, 5)
+    scene['pxy'] = proj_arr[:, 0:2]
+    scene['pvxy'] = proj_arr[:, 2:4]
+    scene['in_flight'] = proj_arr[:, 4].astype(bool)
+    return scene
 
 
 class Renderer2D:
     """2D matplotlib-based renderer for simulation visualization."""
     
-    def __init__(self, world: World, figsize: Tuple[float, float] = (12, 10)):
+    def __init__(self, world: World, figsize: Tuple[float, float] = (12, 10), dpi: float = 100):
+        """
+        Args:
+            world: World to draw
+            figsize: Figure size in inches
+            dpi: Pixels per inch; frames are figsize * dpi pixels
+        """
         self.world = world
         self.figsize = figsize
+        self.dpi = dpi
         self.fig = None
         self.ax = None
         
-        # Stored frames for video generation
-        self.frames = []
+        # Video output: frames are streamed to the sink as they are saved
+        self._video_path = None
+        self._video_fps = 10
+        self._video = None
+        self.frames_written = 0
+        
+        # What save_frame last rendered, so unchanged frames can be re-sent
+        # without drawing; cleared by any other render
+        self._frame_key = None
+        self._last_frame = None
     
     def _setup_figure(self):
-        """Initialize matplotlib figure and axes."""
+        """
+        Initialize matplotlib figure, axes and the persistent scene artists.
+        
+        The figure is bound straight to an offscreen Agg canvas rather than
+        created through pyplot, so rendering never goes through the
+        interactive backend or pyplot's figure manager.
+        """
         if self.fig is None:
-            self.fig, self.ax = plt.subplots(figsize=self.figsize)
+            self.fig = Figure(figsize=self.figsize, dpi=self.dpi)
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.subplots()
             self.ax.set_xlim(0, self.world.params.arena_width)
             self.ax.set_ylim(0, self.world.params.arena_height)
             self.ax.set_aspect('equal')
             self.ax.set_xlabel('X (m)')
             self.ax.set_ylabel('Y (m)')
             self.ax.grid(True, alpha=0.3)
+            self._setup_artists()
     
-    def render(self, title: str = "", debug: bool = False, frame_data: dict = None) -> np.ndarray:
+    def _setup_artists(self):
         """
-        Render world state and return as RGB array.
+        Create the artists render() updates in place each frame.
         
-        Args:
-            title: optional title for the plot
-            debug: if True, show velocity vectors and neighbor links
-            frame_data: optional dict with 'agents' and 'projectiles' lists to render from.
-                        If None, renders current world state. If provided, renders from snapshot.
-        
-        Returns:
-            RGB array (H, W, 3) with values 0-255
+        Agents, projectiles and the title live in a fixed set of collections
+        whose vertices are replaced every frame, instead of clearing the axes
+        and adding one patch per agent and arrow. They are animated: the
+        static layer (axes, grid, blocks) is drawn once and cached, and each
+        frame restores it and draws only these artists on top.
         """
-        self._setup_figure()
-        self.ax.clear()
+        ax = self.ax
+        self._blocks_drawn = 0
+        self._living = PolyCollection([], alpha=0.7, zorder=10,
+                                      edgecolors='black', linewidths=1)
+        self._dead = PolyCollection([], facecolors='grey', alpha=0.5, zorder=5,
+                                    linewidths=2)
+        self._velocity = LineCollection([], colors='black', alpha=0.5, zorder=9)
+        self._flying = LineCollection([], colors='black', alpha=0.9, zorder=8,
+                                      linewidths=0.8)
+        self._embedded = LineCollection([], colors='black', alpha=0.8, zorder=8,
+                                        linewidths=0.8)
+        for collection in (self._living, self._dead, self._velocity,
+                           self._flying, self._embedded):
+            ax.add_collection(collection, autolim=False)
+        self._dots, = ax.plot([], [], 'ko', markersize=3, zorder=8)
+        self._title = ax.set_title('', fontsize=14, weight='bold')
         
-        # Set limits and grid
-        self.ax.set_xlim(0, self.world.params.arena_width)
-        self.ax.set_ylim(0, self.world.params.arena_height)
-        self.ax.set_aspect('equal')
-        self.ax.grid(True, alpha=0.3)
-        
-        # Draw infantry blocks
-        for block in self.world.infantry_blocks:
+        # Drawn in zorder, as a full canvas draw would
+        self._animated = sorted([self._living, self._dead, self._velocity, self._flying,
+                                 self._embedded, self._dots, self._title],
+                                key=lambda artist: artist.get_zorder())
+        for artist in self._animated:
+            artist.set_animated(True)
+        self._background = None
+    
+    def _draw_new_blocks(self):
+        """Add patches for infantry blocks added since the last frame."""
+        if self._blocks_drawn < len(self.world.infantry_blocks):
+            self._background = None
+        for block in self.world.infantry_blocks[self._blocks_drawn:]:
             width = block.x_max - block.x_min
             height = block.y_max - block.y_min
             color = 'lightblue' if block.team == 0 else 'lightcoral'
@@ -72,185 +231,153 @@ class Renderer2D:
             team_label = 'BLUE' if block.team == 0 else 'RED'
             self.ax.text(cx, cy, team_label, ha='center', va='center',
                          fontsize=12, weight='bold')
+        self._blocks_drawn = len(self.world.infantry_blocks)
+    
+    def render(self, title: str = "", debug: bool = False, frame_data: dict = None) -> np.ndarray:
+        """
+        Render world state and return as RGB array.
         
-        # Determine data source: frame_data snapshot or live world
-        if frame_data is not None:
-            agents_to_render = frame_data['agents']
-            projectiles_to_render = frame_data['projectiles']
-        else:
-            agents_to_render = self.world.agents
-            projectiles_to_render = self.world.projectiles
+        Args:
+            title: optional title for the plot
+            debug: if True, show velocity vectors and neighbor links
+            frame_data: optional dict with 'agents' and 'projectiles' to render from,
+                        either lists of per-item dicts or the column dicts of
+                        World.snapshot_arrays(). If None, renders current world state.
+                        An optional 'step_count' entry overrides the world's step count in
+                        the title, so snapshots can be rendered while the world steps on.
         
-        # Draw agents
-        if frame_data is not None:
-            # Render from snapshot data
-            for agent_data in agents_to_render:
-                color = 'blue' if agent_data['team'] == 0 else 'red'
-                x, y = agent_data['x'], agent_data['y']
-                heading = agent_data['heading']
-                alive = agent_data['alive']
-                
-                if alive:
-                    # Draw living agent as triangle pointing in heading direction
-                    radius = self.world.params.agent_radius
-                    angle = heading
-                    vertices = np.array([
-                        [x + radius * np.cos(angle),
-                         y + radius * np.sin(angle)],
-                        [x + radius * np.cos(angle + 2.5),
-                         y + radius * np.sin(angle + 2.5)],
-                        [x + radius * np.cos(angle - 2.5),
-                         y + radius * np.sin(angle - 2.5)]
-                    ])
-                    triangle = patches.Polygon(
-                        vertices, color=color, alpha=0.7, zorder=10,
-                        edgecolor='black', linewidth=1
-                    )
-                    self.ax.add_patch(triangle)
-                else:
-                    # Draw dead agent as grey circle
-                    radius = self.world.params.agent_radius
-                    circle = patches.Circle(
-                        (x, y), radius,
-                        color='grey', alpha=0.5, zorder=5,
-                        edgecolor=color, linewidth=2
-                    )
-                    self.ax.add_patch(circle)
-        else:
-            # Render from live world state
-            for agent in self.world.agents:
-                color = 'blue' if agent.team == 0 else 'red'
-                
-                if agent.alive:
-                    # Draw living agent as triangle pointing in heading direction
-                    radius = self.world.params.agent_radius
-                    # Triangle points: tip at heading direction, base behind
-                    angle = agent.heading
-                    # Create triangle vertices (tip, left corner, right corner)
-                    vertices = np.array([
-                        [agent.x + radius * np.cos(angle),
-                         agent.y + radius * np.sin(angle)],
-                        [agent.x + radius * np.cos(angle + 2.5),
-                         agent.y + radius * np.sin(angle + 2.5)],
-                        [agent.x + radius * np.cos(angle - 2.5),
-                         agent.y + radius * np.sin(angle - 2.5)]
-                    ])
-                    triangle = patches.Polygon(
-                        vertices, color=color, alpha=0.7, zorder=10,
-                        edgecolor='black', linewidth=1
-                    )
-                    self.ax.add_patch(triangle)
-                    
-                    # Draw velocity vector
-                    if debug:
-                        scale = 2.0
-                        self.ax.arrow(
-                            agent.x, agent.y,
-                            agent.vx * scale, agent.vy * scale,
-                            head_width=0.3, head_length=0.2,
-                            fc='black', ec='black', alpha=0.5, zorder=9
-                        )
-                else:
-                    # Draw dead agent as grey circle with team-colored border
-                    radius = self.world.params.agent_radius
-                    circle = patches.Circle(
-                        (agent.x, agent.y), radius,
-                        color='grey', alpha=0.5, zorder=5,
-                        edgecolor=color, linewidth=2
-                    )
-                    self.ax.add_patch(circle)
+        Returns:
+            RGB array (H, W, 3) with values 0-255. The array is a view of the
+            canvas buffer and is overwritten by the next render.
+        """
+        self._frame_key = None
+        self._last_frame = None
+        self._setup_figure()
+        self._draw_new_blocks()
+        scene = _scene_arrays(self.world, frame_data)
+        radius = self.world.params.agent_radius
+        team, xy, alive = scene['team'], scene['xy'], scene['alive']
+        colors = _TEAM_RGBA[(team != 0).view(np.uint8)]
         
-        # Draw projectiles and their trajectories
-        if frame_data is not None:
-            # Render from snapshot data - use arrows like live rendering
-            for proj_data in projectiles_to_render:
-                x, y, z = proj_data['x'], proj_data['y'], proj_data['z']
-                vx, vy = proj_data['vx'], proj_data['vy']
-                v_mag = np.sqrt(vx*vx + vy*vy)
-                state = proj_data.get('state', 'in_flight')
-                
-                # Draw projectile based on state
-                if state == 'in_flight' and v_mag > 0.01:
-                    # In-flight: draw projectile as thin arrow pointing in direction
-                    arrow_length = 1.5  # world units
-                    arrow_scale = arrow_length / (v_mag + 0.001)
-                    
-                    self.ax.arrow(
-                        x, y,
-                        vx * arrow_scale, vy * arrow_scale,
-                        head_width=0.3, head_length=0.25,
-                        fc='black', ec='black', alpha=0.9, zorder=8,
-                        linewidth=0.8
-                    )
-                elif state != 'in_flight':
-                    # Impacted: draw shorter arrow (half length) embedded in ground
-                    if v_mag > 0.01:
-                        arrow_length = 0.75
-                        arrow_scale = arrow_length / (v_mag + 0.001)
-                        self.ax.arrow(
-                            x, y,
-                            vx * arrow_scale, vy * arrow_scale,
-                            head_width=0.3, head_length=0.2,
-                            fc='black', ec='black', alpha=0.8, zorder=8,
-                            linewidth=0.8
-                        )
+        # Living agents: triangles pointing in heading direction
+        # (tip, left corner, right corner)
+        angles = scene['heading'][alive, None] + _TRIANGLE_ANGLES
+        self._living.set_verts(_polygons(xy[alive], radius, angles))
+        self._living.set_facecolor(colors[alive])
+        
+        # Dead agents: grey circles with team-colored border
+        dead = ~alive
+        self._dead.set_verts(_polygons(xy[dead], radius, _CIRCLE_ANGLES))
+        self._dead.set_edgecolor(colors[dead])
+        
+        # Velocity vectors
+        if debug and scene['vxy'] is not None:
+            self._velocity.set_segments(_arrow_segments(
+                xy[alive], scene['vxy'][alive] * 2.0, 0.3, 0.2))
         else:
-            # Render from live world state (original logic)
-            for proj in self.world.projectiles:
-                # Get projectile state
-                x, y, z = proj.position()
-                vx, vy, vz = proj.velocity()
-                v_mag = np.sqrt(vx*vx + vy*vy)
-                
-                # Draw projectile based on state
-                if proj.state.value == 'in_flight' and v_mag > 0.01:
-                    # In-flight: draw projectile as thin arrow pointing in direction
-                    arrow_length = 1.5  # world units
-                    arrow_scale = arrow_length / (v_mag + 0.001)
-                    
-                    self.ax.arrow(
-                        x, y,
-                        vx * arrow_scale, vy * arrow_scale,
-                        head_width=0.3, head_length=0.25,
-                        fc='black', ec='black', alpha=0.9, zorder=8,
-                        linewidth=0.8  # Thin line
-                    )
-                elif proj.state.value != 'in_flight':
-                    # Impacted: draw shorter arrow (half length) embedded in ground
-                    # Use impact velocity direction to show orientation
-                    if v_mag > 0.01:
-                        # Has velocity at impact: draw half-length arrow
-                        arrow_length = 0.75  # Half length when embedded
-                        arrow_scale = arrow_length / (v_mag + 0.001)
-                        self.ax.arrow(
-                            x, y,
-                            vx * arrow_scale, vy * arrow_scale,
-                            head_width=0.3, head_length=0.2,
-                            fc='black', ec='black', alpha=0.8, zorder=8,
-                            linewidth=0.8  # Thin line
-                        )
-                else:
-                    # No velocity at impact: draw as small dot
-                    self.ax.plot(x, y, 'ko', markersize=3, zorder=8)
+            self._velocity.set_segments([])
+        
+        # Projectiles: in flight as thin arrows pointing in direction of
+        # travel, impacted as half-length arrows embedded in the ground, or
+        # a small dot when there was no velocity at impact
+        pxy, pvxy, in_flight = scene['pxy'], scene['pvxy'], scene['in_flight']
+        v_mag = np.hypot(pvxy[:, 0], pvxy[:, 1])
+        moving = v_mag > 0.01
+        unit = pvxy / (v_mag + 0.001)[:, None]
+        flying = in_flight & moving
+        self._flying.set_segments(_arrow_segments(
+            pxy[flying], unit[flying] * 1.5, 0.3, 0.25))
+        embedded = ~in_flight & moving
+        self._embedded.set_segments(_arrow_segments(
+            pxy[embedded], unit[embedded] * 0.75, 0.3, 0.2))
+        dots = ~in_flight & ~moving
+        self._dots.set_data(pxy[dots, 0], pxy[dots, 1])
         
         # Title
-        title_str = f"Step {self.world.step_count}: {title}"
-        self.ax.set_title(title_str, fontsize=14, weight='bold')
+        step_count = self.world.step_count
+        if frame_data is not None:
+            step_count = frame_data.get('step_count', step_count)
+        self._title.set_text(f"Step {step_count}: {title}")
+        
+        # Blit: restore the cached static layer, or draw and cache it when it
+        # changed, then draw the per-frame artists over it
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            canvas.restore_region(self._background)
+        for artist in self._animated:
+            self.ax.draw_artist(artist)
         
         # Convert to RGB array using buffer_rgba for cross-platform compatibility
-        self.fig.canvas.draw()
-        w, h = self.fig.canvas.get_width_height()
-        buf = np.frombuffer(self.fig.canvas.buffer_rgba(), dtype=np.uint8)
+        w, h = canvas.get_width_height()
+        buf = np.frombuffer(canvas.buffer_rgba(), dtype=np.uint8)
         buf = buf.reshape((h, w, 4))
         # Convert RGBA to RGB
         image = buf[:, :, :3]
         
         return image
     
-    def save_frame(self, title: str = "", debug: bool = False):
-        """Capture current frame for video generation."""
-        frame = self.render(title=title, debug=debug)
-        self.frames.append(frame)
+    def open_video(self, output_path: str, fps: int = 10):
+        """
+        Set the MP4 file that save_frame streams into.
+        
+        The encoder is started on the first saved frame, once the frame size
+        is known. Call save_mp4 to finish the file.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._video_path = output_path
+        self._video_fps = fps
+        self.frames_written = 0
+    
+    def save_frame(self, title: str = "", debug: bool = False, frame_data: dict = None):
+        """
+        Render the current frame and stream it to the video opened with open_video.
+        
+        When nothing drawn has changed since the previous save_frame (same
+        agent state hash, step, projectile and block counts, title and
+        debug flag), as when the world is paused, the previous frame is
+        written again without rendering.
+        
+        Args:
+            title, debug: as for render
+            frame_data: optional World.snapshot_arrays() snapshot to draw
+                        instead of the live world, as for render, so frames
+                        can be saved off-thread while the world steps on.
+                        Snapshot frames are always rendered.
+        """
+        if self._video_path is None:
+            raise RuntimeError("open_video must be called before save_frame")
+        world = self.world
+        key = None
+        if frame_data is None:
+            key = (world.get_state_hash(), world.step_count, world.projectile_count,
+                   len(world.infantry_blocks), title, debug)
+        if key is not None and key == self._frame_key:
+            frame = self._last_frame
+        else:
+            frame = self.render(title=title, debug=debug, frame_data=frame_data)
+            self._frame_key = key
+            self._last_frame = frame
+        if self._video is None:
+            h, w = frame.shape[:2]
+            self._video = VideoSink(self._video_path, w, h, fps=self._video_fps)
+        self._video.write(frame)
+        self.frames_written += 1
+    
+    def repeat_frame(self):
+        """
+        Write the frame last saved by save_frame to the video again, without rendering.
+        
+        Lets callers hold a frame while the scene is effectively static and
+        keep the video's timing.
+        """
+        if self._last_frame is None:
+            raise RuntimeError("save_frame must be called before repeat_frame")
+        self._video.write(self._last_frame)
+        self.frames_written += 1
     
     def render_trajectory(self, agent_id: int,
                           trajectory: List[Tuple[float, float]],
@@ -264,77 +391,46 @@ class Renderer2D:
             title: plot title
         """
         self._setup_figure()
-        self.ax.clear()
-        
-        # Draw arena and blocks
-        self.ax.set_xlim(0, self.world.params.arena_width)
-        self.ax.set_ylim(0, self.world.params.arena_height)
-        self.ax.set_aspect('equal')
-        self.ax.grid(True, alpha=0.3)
-        
-        for block in self.world.infantry_blocks:
-            width = block.x_max - block.x_min
-            height = block.y_max - block.y_min
-            color = 'lightblue' if block.team == 0 else 'lightcoral'
-            rect = patches.Rectangle(
-                (block.x_min, block.y_min), width, height,
-                linewidth=2, edgecolor='black', facecolor=color, alpha=0.5
-            )
-            self.ax.add_patch(rect)
         
         # Draw trajectory
+        overlay = []
         if trajectory:
             xs, ys = zip(*trajectory)
-            self.ax.plot(xs, ys, 'o-', linewidth=1, markersize=3, alpha=0.5)
+            overlay += self.ax.plot(xs, ys, 'o-', linewidth=1, markersize=3, alpha=0.5)
             
             # Mark start and end
-            self.ax.plot(xs[0], ys[0], 'go', markersize=8, label='Start')
-            self.ax.plot(xs[-1], ys[-1], 'r*', markersize=15, label='End')
+            overlay += self.ax.plot(xs[0], ys[0], 'go', markersize=8, label='Start')
+            overlay += self.ax.plot(xs[-1], ys[-1], 'r*', markersize=15, label='End')
+            overlay.append(self.ax.legend())
         
-        self.ax.set_title(f"Agent {agent_id} Trajectory: {title}")
-        self.ax.legend()
+        # The overlay is part of this frame's static layer
+        self._background = None
+        image = self.render(title=f"Agent {agent_id} Trajectory: {title}")
         
-        return self.render(title=title)
+        # Drop the overlay so later frames show the plain scene again
+        for artist in overlay:
+            artist.remove()
+        self._background = None
+        return image
     
-    def save_mp4(self, output_path: str, fps: int = 10):
-        """
-        Save collected frames as MP4 video.
-        
-        Requires: pip install opencv-python
-        """
-        if not self.frames:
+    def save_mp4(self):
+        """Finish the video opened with open_video."""
+        if self._video is None:
             print("No frames to save")
             return
-        
-        try:
-            import cv2
-        except ImportError:
-            print("ERROR: opencv-python required for video export. Install: pip install opencv-python")
-            return
-        
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Get frame dimensions
-        h, w = self.frames[0].shape[:2]
-        
-        # Create video writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(str(output_path), fourcc, fps, (w, h))
-        
-        # Write frames
-        for frame in self.frames:
-            # Convert RGB to BGR for OpenCV
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            out.write(frame_bgr)
-        
-        out.release()
-        print(f"Saved video to {output_path}")
-        print(f"Frames: {len(self.frames)}, FPS: {fps}, Duration: {len(self.frames)/fps:.1f}s")
+        self._video.release()
+        self._video = None
+        fps = self._video_fps
+        print(f"Saved video to {self._video_path}")
+        print(f"Frames: {self.frames_written}, FPS: {fps}, Duration: {self.frames_written/fps:.1f}s")
     
     def close(self):
-        """Clean up matplotlib resources."""
+        """Clean up matplotlib resources and finish any open video."""
+        if self._video is not None:
+            self.save_mp4()
+        self._frame_key = None
+        self._last_frame = None
         if self.fig is not None:
-            plt.close(self.fig)
+            self.fig.clear()
             self.fig = None
             self.ax = None
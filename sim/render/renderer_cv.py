@@ -0,0 +1,192 @@
+"""
+Fast 2D rendering with OpenCV for long video runs.
+
+Draws the same scene as Renderer2D (agents, projectile arrows, infantry
+blocks, title) straight into a preallocated BGR canvas with cv2 drawing
+primitives, skipping matplotlib entirely. Output is BGR so frames can be
+handed to cv2.VideoWriter without a colour conversion.
+"""
+
+import cv2
+import numpy as np
+from typing import Tuple
+
+from sim.core import World
+from .renderer2d import (_CIRCLE_ANGLES, _TRIANGLE_ANGLES, _arrow_segments,
+                         _polygons, _scene_arrays)
+
+
+# Fixed-point bits for sub-pixel vertex coordinates passed to cv2
+_SHIFT = 4
+_ONE = 1 << _SHIFT
+
+# BGR colours
+_WHITE = (255, 255, 255)
+_BLACK = (0, 0, 0)
+_GREY = (128, 128, 128)
+_GRID = (230, 230, 230)
+_TEAM_COLORS = {0: (255, 0, 0), 1: (0, 0, 255)}  # blue, red
+_BLOCK_COLORS = {0: (230, 216, 173), 1: (128, 128, 240)}  # lightblue, lightcoral
+
+
+class Renderer2DCV:
+    """2D OpenCV-based renderer, a fast drop-in for Renderer2D.render."""
+    
+    def __init__(self, world: World, figsize: Tuple[float, float] = (12, 10), dpi: float = 100,
+                 margin: int = 40, title_height: int = 40):
+        """
+        Args:
+            world: World to draw
+            figsize: Frame size in inches, as for Renderer2D
+            dpi: Pixels per inch; frames are figsize * dpi pixels
+            margin: Border around the arena (pixels)
+            title_height: Band above the arena reserved for the title (pixels)
+        """
+        self.world = world
+        self.width = int(round(figsize[0] * dpi))
+        self.height = int(round(figsize[1] * dpi))
+        
+        # Arena -> pixel transform with equal aspect, centred in the frame
+        arena_w = world.params.arena_width
+        arena_h = world.params.arena_height
+        self.scale = min((self.width - 2 * margin) / arena_w,
+                         (self.height - 2 * margin - title_height) / arena_h)
+        self.origin_x = (self.width - self.scale * arena_w) / 2
+        self.origin_y = title_height + (self.height - title_height - self.scale * arena_h) / 2
+        self.arena_h = arena_h
+        # Pixel bounds of the arena; drawing outside them is wiped each frame
+        self._left = int(np.floor(self.origin_x))
+        self._top = int(np.floor(self.origin_y))
+        self._right = int(np.ceil(self.origin_x + self.scale * arena_w)) + 1
+        self._bottom = int(np.ceil(self.origin_y + self.scale * arena_h)) + 1
+        
+        self.canvas = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._background = None
+        self._blocks_drawn = -1
+    
+    def _to_pixels(self, points: np.ndarray) -> np.ndarray:
+        """Map (..., 2) arena coordinates to fixed-point (..., 2) int32 pixels."""
+        px = self.origin_x + points[..., 0] * self.scale
+        py = self.origin_y + (self.arena_h - points[..., 1]) * self.scale
+        return np.rint(np.stack([px, py], axis=-1) * _ONE).astype(np.int32)
+    
+    def _build_background(self):
+        """Draw the static layer: arena frame, 10 m grid and infantry blocks."""
+        bg = np.full((self.height, self.width, 3), _WHITE, dtype=np.uint8)
+        arena_w = self.world.params.arena_width
+        for x in np.arange(0, arena_w + 1e-9, 10.0):
+            a, b = self._to_pixels(np.array([[x, 0.0], [x, self.arena_h]]))
+            cv2.line(bg, tuple(a.tolist()), tuple(b.tolist()), _GRID, 1, cv2.LINE_AA, _SHIFT)
+        for y in np.arange(0, self.arena_h + 1e-9, 10.0):
+            a, b = self._to_pixels(np.array([[0.0, y], [arena_w, y]]))
+            cv2.line(bg, tuple(a.tolist()), tuple(b.tolist()), _GRID, 1, cv2.LINE_AA, _SHIFT)
+        corners = self._to_pixels(np.array([[0.0, 0.0], [arena_w, self.arena_h]]))
+        cv2.rectangle(bg, tuple(corners[0].tolist()), tuple(corners[1].tolist()), _BLACK, 1, cv2.LINE_AA, _SHIFT)
+        
+        for block in self.world.infantry_blocks:
+            lo, hi = self._to_pixels(np.array([[block.x_min, block.y_min],
+                                               [block.x_max, block.y_max]]))
+            cv2.rectangle(bg, tuple(lo.tolist()), tuple(hi.tolist()), _BLOCK_COLORS[block.team], -1,
+                          cv2.LINE_AA, _SHIFT)
+            cv2.rectangle(bg, tuple(lo.tolist()), tuple(hi.tolist()), _BLACK, 2, cv2.LINE_AA, _SHIFT)
+            label = 'BLUE' if block.team == 0 else 'RED'
+            cx, cy = self._to_pixels(np.array(block.center())) / _ONE
+            (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            cv2.putText(bg, label, (int(cx - tw / 2), int(cy + th / 2)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, _BLACK, 2, cv2.LINE_AA)
+        
+        self._background = bg
+        self._blocks_drawn = len(self.world.infantry_blocks)
+    
+    def _draw_segments(self, segments: np.ndarray, color):
+        """Draw (N, 2, 2) arena-space line segments in one polylines call."""
+        if len(segments):
+            cv2.polylines(self.canvas, self._to_pixels(segments), False, color, 1,
+                          cv2.LINE_AA, _SHIFT)
+    
+    def render_bgr(self, title: str = "", debug: bool = False, frame_data: dict = None) -> np.ndarray:
+        """
+        Render world state into the canvas and return it as BGR.
+        
+        Args:
+            title, debug, frame_data: as for Renderer2D.render
+        
+        Returns:
+            BGR array (H, W, 3) uint8. The array is the renderer's canvas and
+            is overwritten by the next render.
+        """
+        if self._blocks_drawn != len(self.world.infantry_blocks):
+            self._build_background()
+        canvas = self.canvas
+        np.copyto(canvas, self._background)
+        
+        scene = _scene_arrays(self.world, frame_data)
+        radius = self.world.params.agent_radius
+        team, xy, alive = scene['team'], scene['xy'], scene['alive']
+        
+        for team_id, color in _TEAM_COLORS.items():
+            # Dead agents: grey circles with team-colored border
+            dead = ~alive & (team == team_id)
+            if dead.any():
+                polys = self._to_pixels(_polygons(xy[dead], radius, _CIRCLE_ANGLES))
+                cv2.fillPoly(canvas, polys, _GREY, cv2.LINE_AA, _SHIFT)
+                cv2.polylines(canvas, polys, True, color, 2, cv2.LINE_AA, _SHIFT)
+        
+        # Projectiles: arrows in flight, half-length arrows embedded in the
+        # ground, or a dot when there was no velocity at impact
+        pxy, pvxy, in_flight = scene['pxy'], scene['pvxy'], scene['in_flight']
+        v_mag = np.hypot(pvxy[:, 0], pvxy[:, 1])
+        moving = v_mag > 0.01
+        unit = pvxy / (v_mag + 0.001)[:, None]
+        flying = in_flight & moving
+        self._draw_segments(_arrow_segments(pxy[flying], unit[flying] * 1.5, 0.3, 0.25), _BLACK)
+        embedded = ~in_flight & moving
+        self._draw_segments(_arrow_segments(pxy[embedded], unit[embedded] * 0.75, 0.3, 0.2), _BLACK)
+        for x, y in (self._to_pixels(pxy[~in_flight & ~moving]) // _ONE).tolist():
+            cv2.circle(canvas, (x, y), 2, _BLACK, -1, cv2.LINE_AA)
+        
+        # Velocity vectors
+        if debug and scene['vxy'] is not None:
+            self._draw_segments(_arrow_segments(xy[alive], scene['vxy'][alive] * 2.0, 0.3, 0.2),
+                                _GREY)
+        
+        for team_id, color in _TEAM_COLORS.items():
+            # Living agents: triangles pointing in heading direction
+            living = alive & (team == team_id)
+            if living.any():
+                angles = scene['heading'][living, None] + _TRIANGLE_ANGLES
+                polys = self._to_pixels(_polygons(xy[living], radius, angles))
+                cv2.fillPoly(canvas, polys, color, cv2.LINE_AA, _SHIFT)
+                cv2.polylines(canvas, polys, True, _BLACK, 1, cv2.LINE_AA, _SHIFT)
+        
+        # Clip to the arena, as the matplotlib axes do
+        bg = self._background
+        canvas[:self._top] = bg[:self._top]
+        canvas[self._bottom:] = bg[self._bottom:]
+        canvas[:, :self._left] = bg[:, :self._left]
+        canvas[:, self._right:] = bg[:, self._right:]
+        
+        # Title
+        step_count = self.world.step_count
+        if frame_data is not None:
+            step_count = frame_data.get('step_count', step_count)
+        text = f"Step {step_count}: {title}"
+        (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+        cv2.putText(canvas, text, ((self.width - tw) // 2, int(self.origin_y) - th),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, _BLACK, 2, cv2.LINE_AA)
+        
+        return canvas
+    
+    def render(self, title: str = "", debug: bool = False, frame_data: dict = None) -> np.ndarray:
+        """
+        Render world state and return as RGB array, like Renderer2D.render.
+        
+        Returns:
+            RGB view (H, W, 3) of the canvas, overwritten by the next render
+        """
+        return self.render_bgr(title=title, debug=debug, frame_data=frame_data)[:, :, ::-1]
+    
+    def close(self):
+        """Release the canvas."""
+        self.canvas = None
+        self._background = None
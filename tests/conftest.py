@@ -0,0 +1,11 @@
+"""
+Pytest configuration shared by the whole suite.
+
+Puts the project root on sys.path once, so test modules can import the
+sim package without installing it.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -2,17 +2,13 @@
 Phase 1 Tests: Determinism, Collision, and Bounds Validation
 """
 
-import sys
-from pathlib import Path
+import hashlib
+import json
 
 import numpy as np
 import pytest
 
-# Add sim to path
-sim_path = Path(__file__).parent.parent
-sys.path.insert(0, str(sim_path))
-
-from sim.core import World, GlobalParams
+from sim.core import World, GlobalParams, Event, EventLog
 
 
 class TestDeterminism:
@@ -97,6 +93,52 @@ class TestDeterminism:
             hashes2.append(world2.get_state_hash())
         
         assert hashes1 == hashes2, "Determinism violated in multi-agent scenario"
+    
+    def test_step_many_matches_repeated_step(self):
+        """step_many(n, actions) ends in the same state as n step(actions) calls."""
+        params = GlobalParams()
+        worlds = []
+        for _ in range(2):
+            world = World(params, seed=7)
+            world.add_agent(0, 40.0, 50.0, {})
+            world.add_agent(1, 60.0, 50.0, {})
+            world.launch_projectile(0, 0.0, np.pi / 4, 15.0)
+            worlds.append(world)
+        actions = {0: (5.0, 0.0), 1: (-5.0, 0.0)}
+        
+        impacts = 0
+        for _ in range(60):
+            impacts += worlds[0].step(actions).count_type('projectile_impact')
+        logs = worlds[1].step_many(60, actions, collect_events=True)
+        
+        assert worlds[1].step_count == 60
+        assert worlds[0].get_state_hash() == worlds[1].get_state_hash()
+        assert len(logs) == 60
+        assert sum(log.count_type('projectile_impact') for log in logs) == impacts == 1
+        assert worlds[1].step_many(3) == []
+    
+    def test_running_state_digest(self):
+        """update_state_digest feeds the bytes get_state_hash covers."""
+        world = World(GlobalParams(), seed=8)
+        world.add_agent(0, 40.0, 50.0, {})
+        world.add_agent(1, 60.0, 50.0, {})
+        
+        single = hashlib.blake2b(digest_size=16)
+        world.update_state_digest(single)
+        assert single.hexdigest() == world.get_state_hash()
+        
+        # A run digest differs from one covering a different trajectory
+        digests = []
+        for vx in (5.0, 4.0):
+            world.reset(seed=8)
+            world.add_agent(0, 40.0, 50.0, {})
+            world.add_agent(1, 60.0, 50.0, {})
+            h = hashlib.blake2b(digest_size=16)
+            for _ in range(10):
+                world.step({0: (vx, 0.0)})
+                world.update_state_digest(h)
+            digests.append(h.digest())
+        assert digests[0] != digests[1]
 
 
 class TestCollisions:
@@ -123,10 +165,10 @@ class TestCollisions:
         max_overlap = 0.0
         min_allowed = 2 * params.agent_radius
         
-        # Run simulation
+        # Run simulation; the views read the live SoA rows, so the
+        # lookups above stay valid across steps. step() only reads actions
+        actions = {a1: (5.0, 0.0), a2: (-5.0, 0.0)}
         for step in range(100):
-            agent_a1 = world.agent_dict[a1]
-            agent_a2 = world.agent_dict[a2]
             dist = agent_a1.distance_to(agent_a2)
             min_dist = min(min_dist, dist)
             
@@ -134,7 +176,7 @@ class TestCollisions:
             overlap = min_allowed - dist if dist < min_allowed else 0
             max_overlap = max(max_overlap, overlap)
             
-            world.step({a1: (5.0, 0.0), a2: (-5.0, 0.0)})
+            world.step(actions)
         
         # Verify agents got close
         assert min_dist < 1.0, f"Agents never got close: {min_dist}m"
@@ -159,8 +201,9 @@ class TestCollisions:
         agent_a2.vx = -2.5
         
         # Run simulation
+        actions = {a1: (5.0, 0.0), a2: (-5.0, 0.0)}
         for _ in range(100):
-            world.step({a1: (5.0, 0.0), a2: (-5.0, 0.0)})
+            world.step(actions)
         
         agent_a1 = world.agent_dict[a1]
         agent_a2 = world.agent_dict[a2]
@@ -173,6 +216,21 @@ class TestCollisions:
         assert speed1 < 10.0, f"Agent 1 speed too high: {speed1}"
         assert speed2 < 10.0, f"Agent 2 speed too high: {speed2}"
     
+    def test_overlaps_matches_distance(self):
+        """overlaps (squared distance) should agree with distance_to."""
+        params = GlobalParams()
+        world = World(params, seed=42)
+        a = world.add_agent(0, 50.0, 50.0, {})
+        b = world.add_agent(1, 50.0, 50.0, {})
+        agent_a = world.agent_dict[a]
+        agent_b = world.agent_dict[b]
+        min_dist = 2 * params.agent_radius
+        
+        for offset in (0.0, 0.5 * min_dist, 0.99 * min_dist, 1.01 * min_dist, 3 * min_dist):
+            agent_b.x = 50.0 + offset
+            expected = agent_a.distance_to(agent_b) < min_dist
+            assert agent_a.overlaps(agent_b) == expected, f"offset {offset}"
+    
     def test_collision_events_logged(self):
         """Collision events should be recorded when agents collide."""
         params = GlobalParams()
@@ -199,6 +257,90 @@ class TestCollisions:
         # With close starting distance and high closing velocity, should detect collision
         assert collision_count > 0, \
             "No collision events - agents starting 0.4m apart with 10 m/s closing speed should collide"
+    
+    def test_event_log_batches(self):
+        """EventLog builds Events from its batches in order, on demand."""
+        log = EventLog()
+        log.add_batch('collision', np.array([1, 2]), np.array([3, 4]),
+                      np.array([[1.0, 2.0], [3.0, 4.0]]))
+        log.add_batch('projectile_impact', np.array([5, 6]), None,
+                      np.array([[1.0, 2.0, 0.0], [0.0, 0.0, 0.0]]), has_pos=np.array([True, False]))
+        assert len(log) == 4
+        assert log.count_type('collision') == 2
+        assert log[0] == Event('collision', 1, 3, (1.0, 2.0))
+        assert list(log)[2:] == [Event('projectile_impact', 5, None, (1.0, 2.0, 0.0)),
+                                 Event('projectile_impact', 6, None, None)]
+        
+        log.append(Event('boundary_hit', 7))
+        log.add_batch('collision', np.array([8]), np.array([9]), np.array([[0.5, 0.5]]))
+        assert len(log) == len(list(log)) == 6
+        assert log.count_type('collision') == 3
+        assert [e.agent_id for e in log] == [1, 2, 5, 6, 7, 8]
+    
+    def test_spatial_broad_phase_covers_close_pairs(self):
+        """Grid pairs include every living pair closer than a cell, in i < j order."""
+        params = GlobalParams()
+        world = World(params, seed=8)
+        rng = np.random.default_rng(8)
+        n = 300
+        world.add_agents_bulk(rng.integers(0, 2, n), rng.uniform(40, 60, n), rng.uniform(40, 60, n))
+        world.agent_dict[5].alive = False
+        grid = world.spatial_grid
+        grid.build(world.xy, world.alive)
+        
+        ia, ib = grid.get_all_neighbor_pairs()
+        assert ia.dtype == ib.dtype == np.int32
+        assert (ia < ib).all()
+        emitted = list(zip(ia.tolist(), ib.tolist()))
+        assert emitted == sorted(set(emitted))
+        
+        xy = world.xy.astype(np.float64)
+        d2 = ((xy[:, None] - xy[None]) ** 2).sum(axis=2)
+        i, j = np.nonzero(np.triu(d2 < grid.cell_size ** 2, k=1))
+        close = {(a, b) for a, b in zip(i.tolist(), j.tolist()) if 5 not in (a, b)}
+        assert close <= set(emitted)
+        assert 5 not in ia and 5 not in ib
+    
+    def test_spatial_grid_rebuilds_when_cells_change(self):
+        """Rebuilding skips unchanged cells but tracks moves and deaths."""
+        params = GlobalParams()
+        world = World(params, seed=9)
+        world.add_agents_bulk(np.array([0, 1, 0]), np.array([10.2, 10.4, 50.0]),
+                              np.array([10.2, 10.4, 50.0]))
+        grid = world.spatial_grid
+        grid.build(world.xy, world.alive)
+        rows = grid.rows
+        grid.build(world.xy, world.alive)
+        assert grid.rows is rows
+        
+        world.agents[2].x = 10.6
+        world.agents[2].y = 10.6
+        grid.build(world.xy, world.alive)
+        assert grid.get_neighbors(10.5, 10.5).tolist() == [0, 1, 2]
+        
+        world.agents[1].alive = False
+        grid.build(world.xy, world.alive)
+        assert grid.get_neighbors(10.5, 10.5).tolist() == [0, 2]
+    
+    def test_incremental_grid_matches_fresh_build(self):
+        """Relinking moved agents gives the same pairs as building from scratch."""
+        params = GlobalParams()
+        world = World(params, seed=10)
+        rng = np.random.default_rng(10)
+        n = 400
+        world.add_agents_bulk(rng.integers(0, 2, n), rng.uniform(30, 70, n), rng.uniform(30, 70, n))
+        grid = world.spatial_grid
+        
+        for _ in range(20):
+            world.xy[:] += rng.normal(0, 0.4, (n, 2)).astype(world.xy.dtype)
+            world.alive[rng.integers(0, n, 5)] = False
+            grid.build(world.xy, world.alive)
+            ia, ib = (pairs.copy() for pairs in grid.get_all_neighbor_pairs())
+            
+            grid.clear()
+            grid.build(world.xy, world.alive)
+            fresh_ia, fresh_ib = grid.get_all_neighbor_pairs()
+            assert np.array_equal(ia, fresh_ia) and np.array_equal(ib, fresh_ib)
 
 
 class TestBounds:
@@ -280,6 +422,153 @@ class TestEpisodeTermination:
         assert world.step_count == 0
         assert len(world.agents) == 0
         assert world.max_agent_id == -1
+    
+    def test_bulk_add_matches_individual_add(self):
+        """add_agents_bulk (scalar and per-agent attributes) should match add_agent."""
+        params = GlobalParams()
+        teams = np.array([0, 0, 1, 1], dtype=np.int8)
+        xs = np.array([40.0, 40.5, 60.0, 59.5])
+        ys = np.array([50.0, 50.2, 50.0, 49.8])
+        max_speeds = np.array([2.5, 3.0, 3.5, 4.0])
+        actions = {0: (3.0, 0.0), 1: (3.0, 0.0), 2: (-3.0, 0.0), 3: (-3.0, 0.0)}
+        
+        world1 = World(params, seed=1)
+        for team, x, y, max_speed in zip(teams, xs, ys, max_speeds):
+            world1.add_agent(int(team), float(x), float(y),
+                             {'max_speed': float(max_speed), 'agility': 4.0})
+        
+        world2 = World(params, seed=1)
+        ids = world2.add_agents_bulk(teams, xs, ys,
+                                     {'max_speed': max_speeds, 'agility': 4.0})
+        
+        assert ids.tolist() == [0, 1, 2, 3]
+        assert world2.max_agent_id == 3
+        assert np.array_equal(world2.agent_teams_array, teams)
+        assert np.array_equal(world2.attribute('max_speed'), world1.attribute('max_speed'))
+        assert np.allclose(world2.attribute('max_speed'), max_speeds)
+        for _ in range(50):
+            world1.step(actions)
+            world2.step(actions)
+            assert world1.get_state_hash() == world2.get_state_hash()
+    
+    def test_action_buffer_matches_action_dict(self):
+        """Actions written to world.action_v behave like an actions dict."""
+        params = GlobalParams()
+        world1 = World(params, seed=3)
+        world2 = World(params, seed=3)
+        for world in (world1, world2):
+            world.add_agent(0, 30.0, 40.0, {'cruise_speed': 5.0})
+            world.add_agent(1, 70.0, 40.0, {'cruise_speed': 5.0})
+            world.add_agent(1, 60.0, 60.0, {'cruise_speed': 5.0})
+        
+        for step in range(30):
+            # Agent 2 only gets an action on the first step
+            actions = {0: (4.0, 1.0), 1: (-4.0, 0.5)}
+            if step == 0:
+                actions[2] = (0.0, -3.0)
+            world1.step(actions)
+            
+            for agent_id, (vx, vy) in actions.items():
+                world2.action_v[agent_id] = (vx, vy)
+                world2.has_action[agent_id] = True
+            world2.step()
+            
+            assert not world2.has_action.any()
+            assert world1.get_state_hash() == world2.get_state_hash()
+    
+    def test_alive_per_team_counters(self):
+        """alive_per_team tracks adds, deaths and reset."""
+        params = GlobalParams()
+        world = World(params, seed=5)
+        world.add_agent(0, 30.0, 40.0, {})
+        world.add_agents_bulk(np.array([1, 1, 0]), np.array([60.0, 62.0, 35.0]),
+                              np.array([40.0, 45.0, 45.0]))
+        assert world.alive_per_team[:2].tolist() == [2, 2]
+        
+        world.agent_dict[1].alive = False
+        world.agent_dict[1].alive = False  # no double count
+        assert world.alive_per_team[:2].tolist() == [2, 1]
+        world.agent_dict[1].alive = True
+        assert world.alive_per_team[:2].tolist() == [2, 2]
+        
+        world.reset()
+        assert not world.alive_per_team.any()
+    
+    def test_agent_fields_are_python_floats(self):
+        """Agent views and the state dict serialise like the old Agent fields."""
+        params = GlobalParams()
+        world = World(params, seed=6)
+        agent_id = world.add_agent(0, 20.0, 30.0, {'cruise_speed': 4.0})
+        world.step({agent_id: (3.0, 1.0)})
+        
+        agent = world.agent_dict[agent_id]
+        fields = (agent.x, agent.y, agent.vx, agent.vy, agent.heading,
+                  agent.desired_vx, agent.desired_vy, agent.cruise_speed)
+        assert all(type(value) is float for value in fields)
+        json.dumps(world.get_full_state_dict())
+    
+    def test_snapshot_arrays_copy_state(self):
+        """snapshot_arrays matches the per-agent state and is not a live view."""
+        params = GlobalParams()
+        world = World(params, seed=6)
+        world.add_agents_bulk(np.array([0, 1]), np.array([20.0, 70.0]), np.array([30.0, 60.0]))
+        world.agent_dict[1].alive = False
+        world.launch_projectile(0, 0.5, np.pi/4, 20.0)
+        world.step()
+        
+        snap = world.snapshot_arrays()
+        agents = snap['agents']
+        assert agents['agent_id'].tolist() == [0, 1]
+        assert agents['alive'].tolist() == [True, False]
+        assert (agents['x'][0], agents['y'][0]) == (world.agents[0].x, world.agents[0].y)
+        assert np.array_equal(np.column_stack((agents['vx'], agents['vy'])), world.vxy)
+        proj = world.projectiles[0]
+        assert tuple(snap['projectiles'][k][0] for k in ('x', 'y', 'z')) == proj.position()
+        assert snap['projectiles']['in_flight'].tolist() == [True]
+        
+        world.agents[0].x = 99.0
+        assert agents['x'][0] != 99.0
+    
+    def test_agents_near_matches_brute_force(self):
+        """The CSR agent grid finds exactly the living agents within a radius."""
+        params = GlobalParams()
+        world = World(params, seed=7)
+        rng = np.random.default_rng(7)
+        n = 200
+        world.add_agents_bulk(rng.integers(0, 2, n), rng.uniform(0, 100, n), rng.uniform(0, 100, n))
+        world.agent_dict[3].alive = False
+        world.step()
+        
+        # Built lazily by the first query after the step
+        assert world._agent_grid is None
+        world.agents_near(50.0, 50.0, 4.0)
+        cell_starts, agent_idx = world._agent_grid[3:]
+        assert cell_starts[-1] == agent_idx.size == n - 1
+        xy = world.xy.astype(np.float64)
+        for x, y in rng.uniform(-5, 105, (50, 2)):
+            d2 = ((xy - (x, y)) ** 2).sum(axis=1)
+            expected = np.flatnonzero((d2 <= 16.0) & world.alive)
+            assert world.agents_near(x, y, 4.0).tolist() == expected.tolist()
+    
+    def test_block_distance_batch_matches_scalar(self):
+        """Batched block distances agree with the per-point query."""
+        params = GlobalParams()
+        world = World(params, seed=9)
+        world.add_infantry_block(0, *params.infantry_blue_rect)
+        block = world.infantry_blocks[0]
+        rng = np.random.default_rng(9)
+        xs, ys = rng.uniform(-10, 110, (2, 100))
+        
+        expected = [block.distance_to_boundary(x, y) for x, y in zip(xs, ys)]
+        assert np.allclose(block.distance_to_boundary_batch(xs, ys), expected)
+        assert (block.distance_to_boundary_batch(xs, ys) == 0).any()
+        
+        # World-level (N, K) query over all blocks at once
+        world.add_infantry_block(1, *params.infantry_red_rect)
+        dist = world.blocks_batch_distance(xs, ys)
+        assert dist.shape == (100, 2)
+        for k, b in enumerate(world.infantry_blocks):
+            assert np.allclose(dist[:, k], b.distance_to_boundary_batch(xs, ys))
 
 
 if __name__ == '__main__':
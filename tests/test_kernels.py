@@ -0,0 +1,270 @@
+"""
+Unit tests for the SoA numeric kernels.
+
+Kernels must agree with the reference NumPy formulation whether or not
+Numba is available.
+"""
+
+import numpy as np
+
+from sim.core.kernels import (integrate_positions, nearest_enemies, plan_seek, plan_seek_speeds,
+                              plan_toward, resolve_collisions, update_kinematics)
+from sim.core.projectile_kernels import (STEP_CHUNK, flight_time, impact_time, step_projectiles,
+                                         step_projectiles_parallel)
+from sim.core import World, GlobalParams
+
+
+class TestPlanToward:
+    """Test centroid-seeking action planning."""
+
+    def test_matches_numpy_reference(self):
+        """Velocities point at the target centroid with the given speed."""
+        rng = np.random.default_rng(0)
+        xs, ys = rng.uniform(0, 100, (2, 20))
+        tgt_xs, tgt_ys = rng.uniform(0, 100, (2, 15))
+        alive = rng.random(20) < 0.8
+        tgt_alive = rng.random(15) < 0.8
+
+        out_vx = np.zeros(20)
+        out_vy = np.zeros(20)
+        out_move = np.zeros(20, dtype=bool)
+        n_move = plan_toward(xs, ys, alive, tgt_xs, tgt_ys, tgt_alive, 10.0,
+                             out_vx, out_vy, out_move)
+
+        dx = tgt_xs[tgt_alive].mean() - xs
+        dy = tgt_ys[tgt_alive].mean() - ys
+        mag = np.hypot(dx, dy)
+
+        assert n_move == alive.sum()
+        assert np.array_equal(out_move, alive)
+        assert np.allclose(out_vx[alive], (dx / mag * 10.0)[alive])
+        assert np.allclose(out_vy[alive], (dy / mag * 10.0)[alive])
+
+    def test_no_living_targets(self):
+        """With no living targets nobody moves."""
+        xs = np.array([1.0, 2.0])
+        ys = np.array([1.0, 2.0])
+        alive = np.ones(2, dtype=bool)
+        out_move = np.ones(2, dtype=bool)
+
+        n_move = plan_toward(xs, ys, alive, xs, ys, np.zeros(2, dtype=bool),
+                             10.0, np.zeros(2), np.zeros(2), out_move)
+
+        assert n_move == 0
+        assert not out_move.any()
+
+    def test_agent_at_centroid_gets_no_action(self):
+        """Agents within 0.1 m of the centroid are left alone."""
+        xs = np.array([5.0, 0.0])
+        ys = np.array([5.0, 0.0])
+        alive = np.ones(2, dtype=bool)
+        out_move = np.zeros(2, dtype=bool)
+
+        plan_toward(xs, ys, alive, np.array([5.0]), np.array([5.05]),
+                    np.ones(1, dtype=bool), 10.0, np.zeros(2), np.zeros(2),
+                    out_move)
+
+        assert out_move.tolist() == [False, True]
+
+
+class TestPlanSeek:
+    """Test seeking a fixed point."""
+
+    def test_matches_numpy_reference(self):
+        """Only living agents beyond min_mag2 move, at the given speed."""
+        rng = np.random.default_rng(1)
+        pos = rng.uniform(0, 100, (30, 2))
+        pos[3] = (40.0, 60.05)  # within 0.1 m of the seek point
+        alive = rng.random(30) < 0.7
+        alive[3] = True
+
+        idx, vx, vy = plan_seek(pos, alive, 40.0, 60.0, 8.0, 0.01)
+
+        d = np.array([40.0, 60.0]) - pos
+        mag2 = (d * d).sum(axis=1)
+        expected = np.flatnonzero(alive & (mag2 > 0.01))
+        assert idx.tolist() == expected.tolist()
+        assert 3 not in idx
+        assert np.allclose(vx, d[expected, 0] / np.sqrt(mag2[expected]) * 8.0)
+        assert np.allclose(vy, d[expected, 1] / np.sqrt(mag2[expected]) * 8.0)
+
+    def test_per_agent_speeds(self):
+        """plan_seek_speeds moves every living agent at its own speed."""
+        rng = np.random.default_rng(5)
+        pos = rng.uniform(0, 100, (30, 2)).astype(np.float32)
+        pos[4] = (50.0, 50.0)  # on the seek point
+        alive = rng.random(30) < 0.7
+        alive[4] = True
+        speeds = rng.uniform(2, 8, 30).astype(np.float32)
+        out_v = np.full((30, 2), -1.0, dtype=np.float32)
+        out_move = np.zeros(30, dtype=bool)
+
+        n_move = plan_seek_speeds(pos, alive, 50.0, 50.0, speeds, out_v, out_move)
+
+        d = np.array([50.0, 50.0]) - pos
+        mag = np.hypot(d[:, 0], d[:, 1])
+        moving = alive & (mag > 0)
+        assert n_move == alive.sum()
+        assert np.array_equal(out_move, alive)
+        assert np.allclose(out_v[moving], d[moving] / mag[moving, None] * speeds[moving, None])
+        assert out_v[4].tolist() == [0.0, 0.0]
+        assert (out_v[~alive] == -1.0).all()
+
+
+class TestNearestEnemies:
+    """Test nearest living enemy search."""
+
+    def test_matches_numpy_reference(self):
+        """Each query gets the closest living agent of another team."""
+        rng = np.random.default_rng(2)
+        xy = rng.uniform(0, 100, (40, 2))
+        team = (rng.random(40) < 0.5).astype(np.int8)
+        alive = rng.random(40) < 0.8
+        rows = np.arange(40)
+
+        nearest = nearest_enemies(xy, alive, team, rows)
+
+        for i in rows:
+            enemies = np.flatnonzero(alive & (team != team[i]))
+            d2 = ((xy[enemies] - xy[i]) ** 2).sum(axis=1)
+            assert nearest[i] == enemies[np.argmin(d2)]
+
+    def test_world_query_without_enemies(self):
+        """World.nearest_enemy_indices reports -1 when no enemy is alive."""
+        world = World(GlobalParams(), seed=0)
+        world.add_agent(0, 10.0, 10.0, {})
+        world.add_agent(0, 20.0, 10.0, {})
+        enemy = world.add_agent(1, 30.0, 10.0, {})
+
+        assert world.nearest_enemy_indices(0).tolist() == [enemy, enemy]
+        assert world.nearest_enemy_indices(1).tolist() == [1]
+
+        world.agent_dict[enemy].alive = False
+        world.step()
+        assert world.nearest_enemy_indices(0).tolist() == [-1, -1]
+
+
+class TestAgentUpdate:
+    """Test the fused kinematics and position-integration kernels."""
+
+    def test_kinematics_matches_numpy_reference(self):
+        """Turn-rate and acceleration limits match the vectorized formulation."""
+        rng = np.random.default_rng(3)
+        n = 200
+        alive = rng.random(n) < 0.9
+        desired_v = rng.normal(0, 3, (n, 2)).astype(np.float32)
+        desired_v[::5] = 0.0
+        vxy = rng.normal(0, 2, (n, 2)).astype(np.float32)
+        heading = rng.uniform(-np.pi, np.pi, n).astype(np.float32)
+        agility, max_speed, accel = (np.full(n, v, dtype=np.float32) for v in (2.0, 5.0, 3.0))
+        dt = 0.1
+
+        dvx, dvy = desired_v.astype(np.float64).T
+        vxy_ref = vxy.astype(np.float64)
+        diff = np.arctan2(dvy, dvx) - heading
+        diff = np.clip(np.arctan2(np.sin(diff), np.cos(diff)), -agility * dt, agility * dt)
+        turning = alive & ((dvx != 0) | (dvy != 0))
+        ref_heading = np.where(turning, heading + diff, heading)
+        desired_speed = np.minimum(np.hypot(dvx, dvy), max_speed)
+        speed = np.hypot(vxy_ref[:, 0], vxy_ref[:, 1])
+        new_speed = np.clip(desired_speed, speed - accel * dt, speed + accel * dt)
+        driven = (alive & (desired_speed > 0))[:, None]
+        coasting = (alive & (desired_speed == 0))[:, None]
+        ref_v = np.where(driven, new_speed[:, None] * np.stack(
+            [np.cos(ref_heading), np.sin(ref_heading)], axis=1), vxy_ref)
+        ref_v = np.where(coasting, vxy_ref * 0.95, ref_v)
+
+        update_kinematics(alive, desired_v, vxy, heading, agility, max_speed, accel, dt, 0.95)
+
+        assert np.allclose(heading, ref_heading)
+        assert np.allclose(vxy, ref_v)
+
+    def test_positions_clamped_to_arena(self):
+        """Agents crossing a wall stop margin inside it; dead agents don't move."""
+        xy = np.array([[0.5, 50.0], [50.0, 99.5], [50.0, 50.0], [50.0, 50.0]], dtype=np.float32)
+        vxy = np.array([[-10.0, 1.0], [1.0, 10.0], [1.0, -1.0], [5.0, 5.0]], dtype=np.float32)
+        alive = np.array([True, True, True, False])
+
+        integrate_positions(xy, vxy, alive, 0.1, 0.3, 100.0, 100.0)
+
+        assert np.allclose(xy, [[0.3, 50.1], [50.1, 99.7], [50.1, 49.9], [50.0, 50.0]])
+        assert np.array_equal(vxy, [[0.0, 1.0], [1.0, 0.0], [1.0, -1.0], [5.0, 5.0]])
+
+
+class TestResolveCollisions:
+    """Test the sequential collision narrow phase."""
+
+    def test_separates_overlapping_pair(self):
+        """Overlapping agents are pushed apart and exchange normal velocity."""
+        xy = np.array([[10.0, 10.0], [10.4, 10.0], [20.0, 20.0]])
+        vxy = np.array([[1.0, 0.0], [-1.0, 0.0], [0.0, 0.0]])
+        alive = np.ones(3, dtype=bool)
+        ia = np.array([0, 0, 1])
+        ib = np.array([1, 2, 2])
+        hit_idx = np.empty(3, dtype=np.int64)
+        hit_pos = np.empty((3, 2))
+
+        k = resolve_collisions(ia, ib, xy, vxy, alive, 0.6, hit_idx, hit_pos)
+
+        assert k == 1
+        assert hit_idx[0] == 0
+        assert np.array_equal(hit_pos[0], xy[0])
+        assert xy[1, 0] - xy[0, 0] > 0.4
+        assert np.array_equal(vxy[:2], [[-1.0, 0.0], [1.0, 0.0]])
+
+    def test_skips_dead_agents(self):
+        """Pairs with a dead agent are left untouched."""
+        xy = np.array([[10.0, 10.0], [10.1, 10.0]])
+        vxy = np.zeros((2, 2))
+        alive = np.array([True, False])
+        hit_idx = np.empty(1, dtype=np.int64)
+        hit_pos = np.empty((1, 2))
+
+        k = resolve_collisions(np.array([0]), np.array([1]), xy, vxy, alive, 0.6, hit_idx, hit_pos)
+
+        assert k == 0
+        assert np.array_equal(xy, [[10.0, 10.0], [10.1, 10.0]])
+
+
+class TestBallisticKernels:
+    """Test the ballistic root finders and step kernels."""
+
+    def test_flight_time_matches_numpy_reference(self):
+        """flight_time returns the smallest positive root of z(t) = 0."""
+        rng = np.random.default_rng(3)
+        for z0, vz in zip(rng.uniform(0, 5, 50), rng.uniform(-5, 30, 50)):
+            roots = np.roots([-0.5 * 9.81, vz, z0]).real
+            assert np.isclose(flight_time(z0, vz, 9.81), roots[roots > 0].min())
+        # Starting below ground and moving down never reaches z = 0
+        assert flight_time(-1.0, -2.0, 9.81) == np.inf
+
+    def test_impact_time_within_step(self):
+        """impact_time finds the ground crossing inside the step."""
+        # Falling from 1 m at 0 m/s: crossing at sqrt(2/g)
+        t = impact_time(1.0, 0.0, 0.0, 9.81, 1.0)
+        assert np.isclose(t, np.sqrt(2 / 9.81))
+        # No crossing within dt falls back to dt
+        assert impact_time(100.0, 0.0, 0.0, 9.81, 0.1) == 0.1
+
+    def test_parallel_step_matches_serial(self):
+        """step_projectiles_parallel gives the serial kernel's results exactly."""
+        rng = np.random.default_rng(4)
+        n = 2 * STEP_CHUNK + 37  # ragged final chunk
+        launch = [rng.uniform(0, 100, n), rng.uniform(0, 100, n), rng.uniform(0, 3, n),
+                  rng.uniform(-30, 30, n), rng.uniform(-30, 30, n), rng.uniform(-5, 20, n),
+                  np.full(n, 9.81)]
+        launch = [col.astype(np.float32) for col in launch]
+        t_alive = rng.uniform(0, 3, n)
+
+        results = []
+        for kernel in (step_projectiles, step_projectiles_parallel):
+            t = t_alive.copy()
+            pos = np.zeros((n, 3))
+            vel = np.zeros((n, 3))
+            status = kernel(*launch, t, 0.05, pos, vel)
+            results.append((status, t, pos, vel))
+
+        for serial, parallel in zip(*results):
+            assert np.array_equal(serial, parallel)
+        # The sample covers every outcome
+        assert set(results[0][0].tolist()) == {0, 1, 2}
@@ -11,7 +11,7 @@ Tests:
 
 import pytest
 import numpy as np
-from sim.core.projectile import Projectile, ProjectileState
+from sim.core.projectile import Projectile, ProjectileState, ProjectileFactory, ProjectilePool
 from sim.core import World, GlobalParams
 
 
@@ -130,8 +130,9 @@ class TestTrajectoryIntegration:
             assert abs(x_actual - x_ref) < error_margin, \
                 f"dt={dt}: X position diverged (ref={x_ref:.2f}, got={x_actual:.2f})"
     
-    def test_trajectory_recorded(self):
-        """Test that trajectory is properly recorded."""
+    def test_trajectory_recorded(self, monkeypatch):
+        """Test that trajectory is properly recorded when enabled."""
+        monkeypatch.setattr(Projectile, 'record_trajectory', True)
         proj = Projectile(
             projectile_id=1,
             launcher_id=0,
@@ -156,6 +157,37 @@ class TestTrajectoryIntegration:
         
         # Last point should be impact position
         assert proj.trajectory[-1] == proj.impact_pos
+    
+    def test_precomputed_trajectory_matches_stepping(self, monkeypatch):
+        """precompute_trajectory reproduces a recorded trajectory exactly."""
+        monkeypatch.setattr(Projectile, 'record_trajectory', True)
+        factory = ProjectileFactory()
+        for azimuth, loft, speed in ((0.3, np.pi / 4, 25.0), (2.0, 0.1, 40.0), (4.0, 1.4, 12.0)):
+            proj = factory.launch(0, 0, 50.0, 50.0, 1.5, azimuth, loft, speed)
+            path = proj.precompute_trajectory(0.01)
+            while proj.step(0.01):
+                pass
+            assert [tuple(p) for p in path.tolist()] == proj.trajectory
+    
+    def test_trajectory_not_recorded_by_default(self):
+        """Without recording, the path is sampled analytically instead."""
+        proj = Projectile(
+            projectile_id=1,
+            launcher_id=0,
+            launcher_team=0,
+            x0=10.0, y0=20.0, z0=1.0,
+            vx=5.0,
+            vy=0.0,
+            vz=8.0
+        )
+        while proj.state == ProjectileState.IN_FLIGHT:
+            proj.step(0.1)
+        
+        assert proj.trajectory is None
+        path = proj.sample_trajectory(20)
+        assert path.shape == (20, 3)
+        assert tuple(path[0]) == (10.0, 20.0, 1.0)
+        assert np.allclose(path[-1], proj.impact_pos)
 
 
 class TestImpactDetection:
@@ -300,6 +332,161 @@ class TestWorldIntegration:
             assert abs(x1 - x2) < 1e-6
             assert abs(y1 - y2) < 1e-6
             assert abs(z1 - z2) < 1e-6
+    
+    def test_projectile_pool_recycles_impacted(self, monkeypatch):
+        """Impacted projectiles return to the pool and are reused."""
+        monkeypatch.setattr(Projectile, 'record_trajectory', True)
+        params = GlobalParams()
+        world = World(params, seed=7)
+        world.projectile_pool = ProjectileFactory(params.gravity)
+        agent_id = world.add_agent(team=0, x=50.0, y=50.0, attributes={})
+        
+        world.launch_projectile(agent_id, 0, 45*np.pi/180, 20.0)
+        first = world.projectiles[0]
+        for _ in range(1000):
+            world.step()
+            if world.impacted_count:
+                break
+        
+        assert world.impacted_count == 1
+        assert world.projectiles == []
+        assert world.projectile_dict == {}
+        
+        reused = world.projectile_pool.launch(
+            launcher_id=agent_id, launcher_team=0,
+            x0=10.0, y0=10.0, z0=1.0,
+            azimuth=0.0, loft_angle=np.pi/4, speed=15.0)
+        assert reused is first
+        assert reused.state == ProjectileState.IN_FLIGHT
+        assert reused.trajectory == [(10.0, 10.0, 1.0)]
+        assert reused.impact_pos is None
+    
+    def test_batch_launch_matches_single_launches(self):
+        """Batched launches produce the same projectiles as one-by-one."""
+        params = GlobalParams()
+        azimuths = np.array([0.0, 1.0, 2.5])
+        lofts = np.array([np.pi/6, np.pi/4, np.pi/3])
+        speeds = np.array([20.0, 25.0, 30.0])
+        
+        world1 = World(params, seed=1)
+        world2 = World(params, seed=1)
+        for world in (world1, world2):
+            world.add_agent(team=0, x=20.0, y=30.0, attributes={})
+            world.add_agent(team=1, x=70.0, y=60.0, attributes={})
+        launchers = np.array([0, 1, 1])
+        
+        for aid, az, loft, speed in zip(launchers, azimuths, lofts, speeds):
+            world1.launch_projectile(int(aid), az, loft, speed)
+        ids = world2.launch_projectiles_batch(launchers, azimuths, lofts, speeds)
+        
+        assert ids.tolist() == [0, 1, 2]
+        assert world2.next_projectile_id == 3
+        assert len(world2.in_flight_projectiles) == 3
+        for p1, p2 in zip(world1.projectiles, world2.projectiles):
+            assert p2 is world2.projectile_dict[p2.projectile_id]
+            assert (p1.launcher_id, p1.launcher_team) == (p2.launcher_id, p2.launcher_team)
+            assert (p1.x0, p1.y0, p1.z0) == (p2.x0, p2.y0, p2.z0)
+            assert np.allclose((p1.vx, p1.vy, p1.vz), (p2.vx, p2.vy, p2.vz))
+        
+        # Unknown agents are skipped and reported as -1
+        ids = world2.launch_projectiles_batch(np.array([5, 0]), azimuths[:2], lofts[:2], speeds[:2])
+        assert ids.tolist() == [-1, 3]
+    
+    def test_world_step_matches_scalar_projectile_step(self):
+        """World's batched projectile step matches Projectile.step exactly."""
+        params = GlobalParams()
+        world = World(params, seed=2)
+        world.add_agent(team=0, x=50.0, y=50.0, attributes={})
+        # Includes a shot that leaves the arena and expires
+        launches = [(0.0, np.pi/4, 20.0), (2.0, np.pi/6, 30.0), (4.0, 1.2, 25.0), (0.0, 0.3, 80.0)]
+        for az, loft, speed in launches:
+            world.launch_projectile(0, az, loft, speed)
+        scalar = [Projectile(-1, 0, 0, p.x0, p.y0, p.z0, p.vx, p.vy, p.vz, gravity=p.gravity)
+                  for p in world.projectiles]
+        
+        dt = params.dt
+        for _ in range(60):
+            world.step()
+            for proj in scalar:
+                proj.step(dt)
+        
+        assert world.in_flight_projectiles == []
+        assert {p.state for p in world.projectiles} == {ProjectileState.GROUND_IMPACT,
+                                                        ProjectileState.EXPIRED}
+        for batched, proj in zip(world.projectiles, scalar):
+            assert batched.state == proj.state
+            assert batched.time_alive == proj.time_alive
+            assert batched.impact_pos == proj.impact_pos
+            assert batched.impact_velocity == proj.impact_velocity
+            assert batched.trajectory == proj.trajectory
+    
+    def test_store_columns_match_projectile_views(self):
+        """Bulk pool kinematics agree with the per-projectile views."""
+        params = GlobalParams()
+        world = World(params, seed=3)
+        world.add_agent(team=0, x=40.0, y=60.0, attributes={})
+        world.launch_projectiles_batch(np.zeros(5, dtype=np.int64), np.linspace(0, 2, 5),
+                                       np.linspace(0.3, 1.2, 5), np.linspace(15, 30, 5))
+        for _ in range(40):
+            world.step()
+        
+        rows = world.projectile_rows
+        positions = np.column_stack(world.projectile_store.position_all(rows))
+        velocities = np.column_stack(world.projectile_store.velocity_all(rows))
+        assert world.impacted_count > 0
+        for proj, pos, vel in zip(world.projectiles, positions, velocities):
+            assert tuple(pos) == proj.position()
+            assert tuple(vel) == proj.velocity()
+
+
+class TestProjectilePool:
+    """Test the structure-of-arrays projectile storage."""
+    
+    def test_grows_and_reuses_released_rows(self):
+        """Columns keep their contents across growth; released rows are reused."""
+        pool = ProjectilePool(capacity=2)
+        rows = pool.allocate_batch(np.arange(5), 0, 1, np.arange(5.0), 0.0, 1.0,
+                                   1.0, 0.0, 5.0)
+        assert rows.tolist() == [0, 1, 2, 3, 4]
+        assert pool.capacity >= 5
+        assert pool.x0[:5].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        
+        pool.release(rows[[1, 3]])
+        reused = pool.allocate(9, 0, 1, 7.0, 0.0, 1.0, 1.0, 0.0, 5.0)
+        assert reused in (1, 3)
+        assert pool.size == 5
+        proj = pool.view(reused)
+        assert (proj.projectile_id, proj.x0, proj.state) == (9, 7.0, ProjectileState.IN_FLIGHT)
+    
+    def test_factory_launch_batch_matches_single_launches(self):
+        """A factory batch launch stores the same rows as one-by-one launches."""
+        single, batch = ProjectileFactory(), ProjectileFactory()
+        launches = [(0, 0, 10.0, 20.0, 1.0, 3.0, 4.0, 5.0),
+                    (1, 1, 60.0, 40.0, 1.0, -2.0, 1.0, 8.0)]
+        expected = [single.launch_cartesian(*args) for args in launches]
+        recycled = batch.launch_cartesian(*launches[0])
+        batch.recycle(recycled)
+        
+        projs = batch.launch_batch(*map(np.array, zip(*launches)))
+        assert projs[0] is recycled
+        for exp, proj in zip(expected, projs):
+            assert (proj.launcher_id, proj.launcher_team) == (exp.launcher_id, exp.launcher_team)
+            assert proj.position() == exp.position()
+            assert proj.velocity() == exp.velocity()
+            assert proj.state == ProjectileState.IN_FLIGHT
+        assert [p.projectile_id for p in projs] == [1, 2]
+    
+    def test_add_projectile_moves_state_into_world(self):
+        """A standalone Projectile keeps its identity and state when added."""
+        world = World(GlobalParams(), seed=4)
+        proj = Projectile(-1, 0, 0, 10.0, 20.0, 1.0, 3.0, 4.0, 5.0, time_alive=0.5)
+        scratch, scratch_row = proj._pool, proj._row
+        assert Projectile(-1, 0, 0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)._pool is scratch
+        world.add_projectile(proj)
+        assert proj._pool is world.projectile_store
+        assert scratch_row in scratch._free
+        assert world.in_flight_projectiles == [proj]
+        assert (proj.x0, proj.y0, proj.time_alive) == (10.0, 20.0, 0.5)
 
 
 if __name__ == '__main__':